@@ -0,0 +1,18 @@
+r"""
+Benchmark suite for mechmat.
+
+Run all benchmarks with::
+
+    python -m benchmarks
+
+Store the results as a baseline with ``--save baseline.json`` and compare a later run against it with
+``--compare baseline.json``. Benchmarks which are slower than the baseline by more than the tolerance are reported
+as regressions and result in a non-zero exit status. The cold import time is broken down per module with::
+
+    python -m benchmarks --import-time
+"""
+
+from .runner import benchmark, run, compare, load_results, save_results
+from . import workloads, importtime
+
+__all__ = ['benchmark', 'run', 'compare', 'load_results', 'save_results', 'workloads', 'importtime']
@@ -0,0 +1,45 @@
+import argparse
+import sys
+
+from . import run, compare, load_results, save_results
+from .importtime import import_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the mechmat benchmark suite')
+    parser.add_argument('-k', '--select', help='only run benchmarks of which the name contains this string')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='timed repetitions per benchmark')
+    parser.add_argument('-t', '--min-time', type=float, default=0.2, help='minimum duration of a repetition in s')
+    parser.add_argument('--save', metavar='FILE', help='save the results as json')
+    parser.add_argument('--compare', metavar='FILE', help='compare against results saved earlier')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed relative decrease in ops/sec before reporting a regression')
+    parser.add_argument('--import-time', action='store_true',
+                        help='only break the cold import time of mechmat down per module')
+    args = parser.parse_args(argv)
+
+    if args.import_time:
+        total, modules = import_time('mechmat', number=args.repeat)
+        print('import mechmat: {:.1f} ms'.format(total * 1e3))
+        print()
+        print('{:<50} {:>10} {:>12}'.format('module', 'self [ms]', 'cumul. [ms]'))
+        for name, own, cumulative in modules[:25]:
+            print('{:<50} {:>10.1f} {:>12.1f}'.format(name, own * 1e3, cumulative * 1e3))
+        return 0
+
+    results = run(selection=args.select, repeat=args.repeat, min_time=args.min_time)
+    if args.save:
+        save_results(results, args.save)
+
+    if args.compare:
+        print()
+        regressions = 0
+        for name, ratio, regressed in compare(results, load_results(args.compare), tolerance=args.tolerance):
+            regressions += regressed
+            print('{:<50} {:>8.2f}x {}'.format(name, ratio, 'REGRESSION' if regressed else ''))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+r"""
+Cold import time of mechmat, measured in fresh interpreters with ``python -X importtime``
+"""
+
+import subprocess
+import sys
+
+from .runner import benchmark
+
+__all__ = ['import_time']
+
+
+def _importtime(module):
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True)
+    times = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if own.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def import_time(module='mechmat', number=5):
+    r"""
+    Measure the cold import time of a module
+
+    Args:
+        module (str): The module
+        number (int): The number of fresh interpreters, the fastest import is reported
+
+    Returns:
+        tuple of the import time in seconds and a list of (module, self time, cumulative time) in seconds of the
+        fastest import, slowest cumulative time first
+    """
+    best = None
+    for _ in range(number):
+        times = _importtime(module)
+        if best is None or times[module][1] < best[module][1]:
+            best = times
+    modules = sorted(((name, own * 1e-6, cumulative * 1e-6) for name, (own, cumulative) in best.items()),
+                     key=lambda t: t[2], reverse=True)
+    return best[module][1] * 1e-6, modules
+
+
+@benchmark('import.mechmat')
+def import_mechmat():
+    return lambda: _importtime('mechmat')
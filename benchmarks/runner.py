@@ -0,0 +1,169 @@
+r"""
+Timing and memory measurement of the registered benchmarks
+"""
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from collections import OrderedDict
+
+__all__ = ['benchmark', 'run', 'measure', 'compare', 'load_results', 'save_results']
+
+_benchmarks = OrderedDict()
+
+
+def benchmark(name):
+    r"""
+    Decorator registering a benchmark. The decorated function performs the setup and returns the callable which is
+    timed, optionally together with a dictionary of extra information which is added to the results.
+
+    Args:
+        name (str): Unique name of the benchmark
+
+    Returns:
+        The decorator
+    """
+
+    def register(setup):
+        if name in _benchmarks:
+            raise KeyError('Benchmark {} is already registered'.format(name))
+        _benchmarks[name] = setup
+        return setup
+
+    return register
+
+
+def _calibrate(func, min_time):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed > 0. else number * 10
+
+
+def measure(func, repeat=5, min_time=0.2):
+    r"""
+    Measure the throughput and peak memory of a callable
+
+    Args:
+        func: Callable without arguments
+        repeat (int): Number of timed repetitions, the fastest is reported
+        min_time (float): Minimum duration of a single repetition in seconds
+
+    Returns:
+        dict: ops/sec, mean time per operation in seconds, number of operations per repetition and the peak memory
+        of a single operation in KiB
+    """
+    number = _calibrate(func, min_time)
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return OrderedDict([('ops_per_sec', 1. / best if best > 0. else float('inf')),
+                        ('time_per_op', sum(timings) / len(timings)),
+                        ('number', number),
+                        ('peak_memory_kib', peak / 1024.)])
+
+
+def run(selection=None, repeat=5, min_time=0.2, report=print):
+    r"""
+    Run the registered benchmarks
+
+    Args:
+        selection (str): Only run benchmarks of which the name contains this string
+        repeat (int): Number of timed repetitions per benchmark
+        min_time (float): Minimum duration of a single repetition in seconds
+        report: Callable receiving a line of text per finished benchmark, None to run silently
+
+    Returns:
+        dict: Results per benchmark name
+    """
+    results = OrderedDict()
+    for name, setup in _benchmarks.items():
+        if selection is not None and selection not in name:
+            continue
+        func = setup()
+        info = {}
+        if isinstance(func, tuple):
+            func, info = func
+        result = measure(func, repeat=repeat, min_time=min_time)
+        result.update(info)
+        results[name] = result
+        if report is not None:
+            report('{:<50} {:>12.1f} ops/sec {:>10.1f} KiB'.format(name, result['ops_per_sec'],
+                                                                   result['peak_memory_kib']))
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    r"""
+    Compare results against a baseline
+
+    Args:
+        results (dict): Results of :func:`run`
+        baseline (dict): Results of an earlier run
+        tolerance (float): Allowed relative decrease in ops/sec before a benchmark counts as a regression
+
+    Returns:
+        list: Tuples of (name, ratio, regressed) for all benchmarks present in both, where ratio is the ops/sec
+        relative to the baseline
+    """
+    comparison = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+        comparison.append((name, ratio, ratio < 1. - tolerance))
+    return comparison
+
+
+def save_results(results, filename):
+    r"""
+    Save results as json, together with a description of the machine and Python version
+
+    Args:
+        results (dict): Results of :func:`run`
+        filename (str): The json file
+    """
+    data = OrderedDict([('machine', platform.machine()),
+                        ('python', platform.python_version()),
+                        ('benchmarks', results)])
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(filename):
+    r"""
+    Load results saved with :func:`save_results`
+
+    Args:
+        filename (str): The json file
+
+    Returns:
+        dict: Results per benchmark name
+    """
+    with open(filename) as f:
+        return json.load(f)['benchmarks']
@@ -0,0 +1,241 @@
+r"""
+Representative mechmat workloads
+"""
+
+import inspect
+import os
+import tempfile
+
+import dill
+from numpy import linspace, logspace, meshgrid, stack
+
+from mechmat import ureg, polymer, serialization
+from mechmat.core.memoization import TransformCache
+from mechmat.core.propagation import graph_for
+from mechmat.material import material_factory, material_type_factory, Material
+from mechmat.batch import MaterialBatch
+from mechmat.library import Library
+from mechmat.store import StateStore
+from mechmat.stream import stream, read_array
+from mechmat.sweep import sweep
+
+from .runner import benchmark
+
+_state = dict(temperature=200. * ureg.degC, pressure=10. * ureg.MPa, shear_rate=100. * ureg.s ** -1)
+
+
+def _pla(**kwargs):
+    state = dict(_state)
+    state.update(kwargs)
+    return material_factory(polymer.PolyLacticAcid, flow=True, name='PLA', **state)
+
+
+@benchmark('material_factory')
+def factory():
+    return lambda: material_factory(polymer.PolyLacticAcid, flow=True, **_state)
+
+
+def _polymer_instantiation(cls):
+    material = material_type_factory(cls, flow=True)
+    return lambda: material()
+
+
+for _name, _cls in inspect.getmembers(polymer, inspect.isclass):
+    if _cls.__module__ == polymer.__name__:
+        benchmark('instantiate.{}'.format(_name))(lambda cls=_cls: _polymer_instantiation(cls))
+
+
+def _update(attr, values):
+    def setup():
+        mat = _pla()
+        cycle = [values[0], values[1]]
+
+        def update():
+            setattr(mat, attr, cycle[0])
+            cycle.reverse()
+
+        return update, {'fan_out': len(graph_for(mat).plan(mat, attr))}
+
+    return setup
+
+
+benchmark('update.temperature')(_update('temperature', [200. * ureg.degC, 230. * ureg.degC]))
+benchmark('update.pressure')(_update('pressure', [10. * ureg.MPa, 80. * ureg.MPa]))
+benchmark('update.shear_rate')(_update('shear_rate', [100. * ureg.s ** -1, 1e4 * ureg.s ** -1]))
+
+
+@benchmark('update.state')
+def update_state():
+    mat = _pla()
+    cycle = [dict(temperature=200. * ureg.degC, pressure=10. * ureg.MPa, shear_rate=100. * ureg.s ** -1),
+             dict(temperature=230. * ureg.degC, pressure=80. * ureg.MPa, shear_rate=1e4 * ureg.s ** -1)]
+
+    def update():
+        mat.update(**cycle[0])
+        cycle.reverse()
+
+    return update
+
+
+@benchmark('call.derive_state')
+def derive_state():
+    mat = _pla()
+    return lambda: mat(temperature=230. * ureg.degC)
+
+
+@benchmark('crosswlf.shear_rate_sweep')
+def crosswlf_sweep():
+    mat = _pla()
+    shear_rate = logspace(0, 5, 1000) * ureg.s ** -1
+
+    def sweep():
+        mat.shear_rate = shear_rate
+        return mat.viscosity_dynamic
+
+    return sweep
+
+
+@benchmark('crosswlf.temperature_sweep')
+def crosswlf_temperature_sweep():
+    mat = _pla()
+    temperature = linspace(180., 250., 1000) * ureg.degC
+
+    def sweep():
+        mat.temperature = temperature
+        return mat.viscosity_dynamic
+
+    return sweep
+
+
+@benchmark('crosswlf.fused_derivatives')
+def crosswlf_fused():
+    mat = _pla()
+    temperature = linspace(180., 250., 1000)[:, None] * ureg.degC
+    shear_rate = logspace(0, 5, 100) * ureg.s ** -1
+    return lambda: mat.viscosity_dynamic_grid(temperature, 10. * ureg.MPa, shear_rate, derivatives=True)
+
+
+@benchmark('twodomaintaitpvt.grid')
+def pvt_grid():
+    mat = _pla()
+    T, p = meshgrid(linspace(20., 250., 100), linspace(0.1, 200., 100))
+    temperature = T * ureg.degC
+    pressure = p * ureg.MPa
+
+    def grid():
+        return mat(temperature=temperature, pressure=pressure).specific_volume
+
+    return grid
+
+
+@benchmark('twodomaintaitpvt.fused_grid')
+def pvt_fused_grid():
+    mat = _pla()
+    temperature = linspace(20., 250., 1000)[:, None] * ureg.degC
+    pressure = linspace(0.1, 200., 1000) * ureg.MPa
+    return lambda: mat.specific_volume_grid(temperature, pressure)
+
+
+@benchmark('dill.round_trip')
+def dill_round_trip():
+    mat = _pla()
+    filename = os.path.join(tempfile.mkdtemp(), 'pla.mat')
+
+    def round_trip():
+        with open(filename, 'wb') as f:
+            dill.dump(mat, f)
+        with open(filename, 'rb') as f:
+            return dill.load(f)
+
+    return round_trip
+
+
+@benchmark('serialization.round_trip')
+def serialization_round_trip():
+    mat = _pla()
+    filename = os.path.join(tempfile.mkdtemp(), 'pla.mat')
+
+    def round_trip():
+        Material.dump(mat, filename)
+        return Material.load(filename)
+
+    return round_trip
+
+
+@benchmark('serialization.load_states')
+def serialization_load_states():
+    mat = _pla()
+    filename = os.path.join(tempfile.mkdtemp(), 'states.npz')
+    serialization.dump([mat(temperature=t * ureg.degC) for t in linspace(180., 250., 100)], filename)
+    return lambda: serialization.load(filename)
+
+
+@benchmark('library.find_cas')
+def library_find_cas():
+    mat = _pla()
+    path = os.path.join(tempfile.mkdtemp(), 'grades')
+    grades = [mat(temperature=t * ureg.degC, name='PLA {}'.format(i), CAS='{}-00-0'.format(i))
+              for i, t in enumerate(linspace(180., 250., 500))]
+    Library.create(path, grades)
+    return lambda: Library(path).find(CAS='250-00-0')
+
+
+@benchmark('store.read_column')
+def store_read_column():
+    mat = _pla()
+    path = os.path.join(tempfile.mkdtemp(), 'sweep')
+    StateStore.create(path, [mat(temperature=t * ureg.degC) for t in linspace(180., 250., 200)])
+    return lambda: StateStore(path)['viscosity_dynamic'].m.sum()
+
+
+@benchmark('sweep.doe')
+def sweep_doe():
+    mat = _pla()
+    states = [{'temperature': t * ureg.degC, 'pressure': p * ureg.MPa, 'shear_rate': g / ureg.s}
+              for t in linspace(180., 250., 8) for p in (0.1, 50., 100.) for g in (10., 100., 1000.)]
+    return lambda: sweep(mat, states, ['viscosity_dynamic', 'specific_volume'])
+
+
+@benchmark('stream.array')
+def stream_array():
+    mat = _pla()
+    rows = stack([linspace(180., 250., 100000), linspace(0.1, 100., 100000), logspace(1., 3., 100000)], axis=-1)
+    units = {'temperature': 'degC', 'pressure': 'MPa', 'shear_rate': '1/s'}
+
+    def evaluate():
+        for _ in stream(mat, read_array(rows, list(units), units, chunksize=10000), ['viscosity_dynamic']):
+            pass
+
+    return evaluate
+
+
+@benchmark('batch.masked_update')
+def batch_masked_update():
+    temperature = linspace(180., 260., 100000) * ureg.degC
+    batch = MaterialBatch(_pla(), temperature=temperature, pressure=10. * ureg.MPa, shear_rate=100. / ureg.s)
+    mask = batch['temperature'] > 250. * ureg.degC
+
+    def update():
+        batch.update(mask, shear_rate=1000. / ureg.s)
+        return batch.viscosity_dynamic
+
+    return update
+
+
+def _revisit(cache):
+    def setup():
+        mat = _pla()
+        mat.cache = cache
+        states = [(T * ureg.degC, g / ureg.s) for T in (200., 210., 220.) for g in (10., 100., 1000.)]
+
+        def revisit():
+            for temperature, shear_rate in states:
+                mat.update(temperature=temperature, shear_rate=shear_rate)
+
+        return revisit
+
+    return setup
+
+
+benchmark('revisit.uncached')(_revisit(None))
+benchmark('revisit.memoized')(_revisit(TransformCache()))
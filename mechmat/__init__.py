@@ -9,10 +9,19 @@ __version__ = '0.2.4'
 from pint import UnitRegistry, set_application_registry
 
 ureg = UnitRegistry(autoconvert_offset_to_baseunit=True, default_as_delta=False)
-ureg.setup_matplotlib(True)
 Q_ = ureg.Quantity
 set_application_registry(ureg)
 
-from mechmat.core.bibliography import bib
+from mechmat.core.imports import when_imported
+
+when_imported('matplotlib', lambda matplotlib: ureg.setup_matplotlib(True))
+
 from mechmat.core.chainable import Chainable, Guarded
 from mechmat.material import material_factory
+
+
+def __getattr__(name):
+    if name == 'bib':
+        from mechmat.core.bibliography import bibliography
+        return bibliography()
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
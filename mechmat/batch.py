@@ -0,0 +1,147 @@
+r"""
+Struct-of-arrays container of many states of a material.
+
+A material state per integration point of a finite element model means millions of states. As separate
+:class:`~mechmat.core.chainable.Chainable` instances, each carries its own link graph and guards. A
+:class:`MaterialBatch` holds all those states as a single state of the material in which the state variables are
+contiguous arrays with an element per state. The link graph and guards are therefore stored once, and the
+propagation runs column-wise over all states with the vectorized transforms::
+
+    batch = MaterialBatch(pla, temperature=T, pressure=p, shear_rate=shear_rate)
+    batch.update(batch.temperature > 250. * ureg.degC, shear_rate=0. / ureg.s)
+    viscosity = batch.viscosity_dynamic
+
+Properties are evaluated lazily, only the properties which are read are computed, for all states at once.
+"""
+
+from numpy import asarray, broadcast_to, float64, ndim
+
+from mechmat import ureg
+
+__all__ = ['MaterialBatch']
+
+
+class MaterialBatch:
+    r"""
+    States of a material with the state variables as columns
+
+    Args:
+        material: The material, the batch is derived from it
+        size (int): The number of states, defaults to the length of the columns
+        **columns: The state variables, as Quantity arrays with an element per state or scalars which are the same for
+         all states
+
+    Raises:
+        ValueError: When the columns don't have the same length
+    """
+
+    def __init__(self, material, size=None, **columns):
+        self.__dict__['material'] = material
+        if size is None:
+            lengths = {len(value) for value in columns.values() if ndim(getattr(value, 'm', value))}
+            if len(lengths) > 1:
+                raise ValueError('Columns have different lengths: {}'.format(sorted(lengths)))
+            size = lengths.pop() if lengths else 1
+        self.__dict__['size'] = size
+        self.__dict__['_columns'] = {}
+        self.__dict__['_units'] = {}
+        for name, value in columns.items():
+            self._set_column(name, value)
+        state = material()
+        state.lazy = True
+        state.update(**{name: self[name] for name in self._columns})
+        self.__dict__['state'] = state
+
+    def _set_column(self, name, value):
+        if isinstance(value, ureg.Quantity):
+            self._units[name] = value.u
+            value = value.m
+        else:
+            self._units[name] = None
+        self._columns[name] = broadcast_to(asarray(value, dtype=float64), (self.size,)).copy()
+
+    @property
+    def columns(self):
+        r"""
+        list: The state variables stored as columns """
+        return list(self._columns)
+
+    def __len__(self):
+        return self.size
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+        return getattr(self.state, item)
+
+    def __setattr__(self, key, value):
+        self.update(**{key: value})
+
+    def column(self, name):
+        r"""
+        A property of all states as an array with an element per state, properties which are the same for all states
+        are broadcast without copying them
+
+        Args:
+            name (str): The property
+
+        Returns:
+            Quantity array
+        """
+        if name in self._columns:
+            return self[name]
+        value = getattr(self.state, name)
+        if isinstance(value, ureg.Quantity):
+            return ureg.Quantity(broadcast_to(value.m, (self.size,)), value.u)
+        return broadcast_to(value, (self.size,))
+
+    def update(self, mask=None, **values):
+        r"""
+        Set state variables of all states, or of the states selected by a mask, and propagate them column-wise
+
+        Args:
+            mask: Boolean array, integer indices or a slice selecting the states to update, None updates all states
+            **values: The state variables, as Quantity scalars or arrays matching the selected states
+        """
+        changed = {}
+        for name, value in values.items():
+            if mask is None:
+                self._set_column(name, value)
+            else:
+                if name not in self._columns:
+                    self._set_column(name, self.column(name))
+                unit = self._units[name]
+                column = self._columns[name].copy()
+                column[mask] = value.m_as(unit) if unit is not None else value
+                self._columns[name] = column
+            changed[name] = self[name]
+        self.state.update(**changed)
+
+    def __getitem__(self, item):
+        r"""
+        A column, a single state or a batch of a selection of the states
+
+        Args:
+            item: The name of a state variable, the index of a state, or a slice, boolean mask or integer indices
+             selecting states
+
+        Returns:
+            The column as Quantity array for a name, a material state for an index, otherwise a
+            :class:`MaterialBatch`
+        """
+        if isinstance(item, str):
+            unit = self._units[item]
+            return self._columns[item] if unit is None else ureg.Quantity(self._columns[item], unit)
+        columns = {name: self._columns[name][item] for name in self._columns}
+        columns = {name: value if self._units[name] is None else ureg.Quantity(value, self._units[name])
+                   for name, value in columns.items()}
+        if ndim(item) == 0 and not isinstance(item, slice):
+            return self.material(**columns)
+        return MaterialBatch(self.material, **columns)
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def __repr__(self):
+        return '<MaterialBatch of {} states with columns {}>'.format(self.size, ', '.join(self._columns))
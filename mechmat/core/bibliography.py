@@ -1,6 +1,112 @@
-from mechcite import Bibliography
-from pkg_resources import resource_filename
+r"""
+Citations of the sources of the models and material data.
 
-bib = Bibliography()
-bib_file = resource_filename('mechmat', 'resources/sources.bib')
-bib.load_bib(bib_file, bib.loaded)
+Loading the bibliography requires mechcite, pybtex and pytablewriter and parsing the bundled bib file, which is
+deferred until the bibliography is used. Citations made before that are queued and added when it is loaded.
+
+The :func:`cite` decorator replaces `mechcite.cite`. It only marks a function or value with its source, it doesn't
+wrap the function. The sources are collected lazily: those of a material class, i.e. its decorated methods and the
+cited values set by its __init__, when the class is first instantiated, and those of the transforms of a propagation
+plan when the plan is first executed. Functions called directly, outside of a material, are not cited. Recording
+can be switched off with :func:`citations`, per thread and asynchronous task.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+__all__ = ['cite', 'cite_key', 'cite_sources', 'citations', 'bibliography']
+
+bib_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'sources.bib')
+
+_bib = None
+_pending = set()
+
+enabled = ContextVar('enabled', default=True)
+r"""ContextVar: Whether citations are recorded in the current context, see :func:`citations`"""
+
+
+def bibliography():
+    r"""
+    The bibliography of mechmat, loaded on first use
+
+    Returns:
+        `mechcite.Bibliography`
+    """
+    global _bib
+    if _bib is None:
+        from mechcite import Bibliography
+        bib = Bibliography()
+        bib.load_bib(bib_file, append=True)
+        _bib = bib
+    while _pending:
+        _bib.cite(_pending.pop())
+    return _bib
+
+
+def cite_key(key):
+    r"""
+    Cite a source
+
+    Args:
+        key (str): The key of the source in the bibliography
+    """
+    if not enabled.get():
+        return
+    if _bib is None:
+        _pending.add(key)
+    else:
+        _bib.cite(key)
+
+
+def cite_sources(*objects):
+    r"""
+    Cite the sources of functions and values marked with :func:`cite`, unmarked objects are skipped
+
+    Args:
+        *objects: The functions and values
+    """
+    for obj in objects:
+        for key in getattr(obj, '__dict__', {}).get('_cite', ()):
+            cite_key(key)
+
+
+@contextmanager
+def citations(record=True):
+    r"""
+    Context manager switching the recording of citations on or off, such as off for production runs of which no
+    bibliography is reported. Sources which are only used while recording is off are missing from the bibliography.
+    The switch applies to the current thread or asynchronous task, other threads keep recording.
+
+    Args:
+        record (bool): Whether citations are recorded within the context
+    """
+    token = enabled.set(record)
+    try:
+        yield
+    finally:
+        enabled.reset(token)
+
+
+class cite(object):
+    r"""
+    Decorator marking a function, or a value, as originating from a source. Marked values are cited when they are
+    assigned to a Guarded attribute, marked functions when they are used by a material, see the module documentation.
+    Stacked decorators mark the function with each of their sources.
+
+    Args:
+        key (str): The key of the source in the bibliography
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __call__(self, f):
+        f._cite = (self.key,) + getattr(f, '__dict__', {}).get('_cite', ())
+        return f
+
+
+def __getattr__(name):
+    if name == 'bib':
+        return bibliography()
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
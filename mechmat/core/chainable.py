@@ -1,22 +1,45 @@
 import logging
-from copy import deepcopy
+from contextlib import contextmanager
+from copy import copy, deepcopy
+from time import perf_counter
 
-from numpy import isnan, any
+from numpy import isnan, all, shape
 from pint import DimensionalityError
-from pytablewriter import MarkdownTableWriter, HtmlTableWriter, LatexTableWriter
 
 from mechmat import ureg
+from . import memoization, tracing
+from . import bibliography
 from .errors import OutOfRangeError
-from mechcite import Bibliography
-
-
-class Message(set):
-    r"""
-    Linked Message
-    """
-
-    def __repr__(self):
-        return super(Message, self).__repr__()
+from .propagation import graph_for
+from .units import kernel_of, to_si, from_si
+
+_log = logging.getLogger(__name__)
+
+
+def _merge_sources(*keys):
+    sources = sorted({source for key in keys for source in ((key,) if isinstance(key, str) else key)})
+    return sources[0] if len(sources) == 1 else tuple(sources)
+
+
+def _equal(old, new, rtol=0.):
+    if old is new:
+        return True
+    if old is None or new is None:
+        return False
+    try:
+        if isinstance(old, ureg.Quantity) or isinstance(new, ureg.Quantity):
+            if not (isinstance(old, ureg.Quantity) and isinstance(new, ureg.Quantity)):
+                return False
+            if old._units != new._units:
+                new = new.to(old._units)
+            old, new = old._magnitude, new._magnitude
+        if shape(old) != shape(new):
+            return False
+        if rtol:
+            return bool(all(abs(new - old) <= rtol * abs(old)))
+        return bool(all(old == new))
+    except (TypeError, ValueError, DimensionalityError):
+        return False
 
 
 class Guarded:
@@ -28,10 +51,31 @@ class Guarded:
         pass
 
     def __get__(self, instance, owner):
-        return getattr(instance, self.guard_name)
+        if instance is None:
+            return self
+        dirty = instance._dirty
+        if dirty and self.name in dirty:
+            instance._pull(self.name)
+        value = getattr(instance, self.guard_name)
+        if value is None and instance._si and self.name in instance._si:
+            value = from_si(instance._si[self.name], getattr(instance, self.unit_name))
+            instance.__dict__[self.guard_name] = value
+        return value
 
     def __set__(self, instance, value):
         unit = getattr(instance, self.unit_name)
+        if instance._si is not None and unit is not None:
+            if value is not None:
+                try:
+                    magnitude = to_si(value, unit)
+                except DimensionalityError as e:
+                    raise DimensionalityError(e.units1, e.units2, e.dim1, e.dim2,
+                                              'Wrong dimensions when setting {} with value {}'.format(
+                                                  self.name, value))
+                Guarded.cite_value(value)
+                self.set_magnitude(instance, magnitude)
+                return
+            instance._si.pop(self.name, None)
         if isinstance(value, ureg.Quantity) and unit is not None:
             try:
                 value = value.to(unit)
@@ -58,12 +102,27 @@ class Guarded:
         setattr(owner, self.rng_name, None)
         setattr(owner, self.unit_name, None)
 
-    _bib = Bibliography()
+    def set_magnitude(self, instance, magnitude):
+        r"""
+        Set the value of an instance on the SI-magnitude fast path
+
+        Args:
+            instance (Chainable): The instance
+            magnitude: The magnitude in the SI base units of the guard unit
+        """
+        unit = getattr(instance, self.unit_name)
+        rng = getattr(instance, self.rng_name)
+        if rng is not None:
+            low, high = to_si(rng, unit)
+            if not all(((low <= magnitude) & (high >= magnitude)) | isnan(magnitude)):
+                raise OutOfRangeError(from_si(magnitude, unit), rng, self.name)
+        instance._si[self.name] = magnitude
+        instance.__dict__[self.guard_name] = None
 
     @staticmethod
     def in_range(value, rng):
         r"""
-        is value in specified range
+        is value in specified range, arrays are in range when every element is either in range or NaN
 
         Args:
             value: value to be tested
@@ -73,17 +132,81 @@ class Guarded:
             true when in range otherwise false
         """
         if isinstance(value, ureg.Quantity):
-            return any(((rng[0].m <= value.m) & (rng[1].m >= value.m))) or any(isnan(value.m))
-        else:
-            return any(((rng[0].m <= value) & (rng[1].m >= value))) or any(isnan(value))
+            value = value.m
+        return all(((rng[0].m <= value) & (rng[1].m >= value)) | isnan(value))
 
     @staticmethod
     def cite_value(value):
-        if hasattr(value, '_cite'):
-            Guarded._bib.cite(getattr(value, '_cite'))
+        if bibliography.enabled.get():
+            bibliography.cite_sources(value)
+
+
+class ChainableType(type):
+    r"""
+    Metaclass of Chainable. The guard settings and link graph which the __init__ of a class sets are the same for
+    every instance constructed without arguments. They are recorded once per class, by constructing a template
+    instance and moving them to the class. Its other values are recorded as well, instances constructed without
+    arguments get a shallow copy of them. Their link graph is copied before it is modified, as for derived states.
+    """
+
+    _instance_attributes = ('_inputs', '_dirty', '_si', '_batch', '_lazy', '_tracer', '_cache', '_tolerance',
+                            '_links_shared')
+
+    _class_attributes = ('_depended_on', '_linked_attributes', '_linked_attributes_args', '_propagation', '_state',
+                         '_logistic_properties')
+
+    def __call__(cls, *args, **kwargs):
+        if args or kwargs:
+            instance = super(ChainableType, cls).__call__(*args, **kwargs)
+            if instance._inputs is not None:
+                instance.__dict__['_inputs'] = dict.fromkeys(instance._inputs, False)
+        else:
+            inputs = cls.freeze()
+            instance = cls.__new__(cls)
+            instance.__dict__.update({key: copy(value) for key, value in cls._frozen_values.items()})
+            instance.__dict__['_inputs'] = dict(inputs)
+        if not cls.__dict__.get('_cited') and bibliography.enabled.get():
+            cls.cite_sources()
+        return instance
+
+    def cite_sources(cls):
+        r"""
+        Cite the sources of the class, its methods marked with :func:`~mechmat.core.bibliography.cite` and the cited
+        values recorded from its template
+        """
+        for base in cls.__mro__:
+            bibliography.cite_sources(*vars(base).values())
+            bibliography.cite_sources(*vars(base).get('_frozen_values', {}).values())
+        cls._cited = True
 
+    def freeze(cls):
+        r"""
+        Record the guard settings, link graph and values of the class from a template instance, when not done yet
 
-class Chainable:
+        Returns:
+            dict of the inputs set by the __init__ of the class
+        """
+        inputs = cls.__dict__.get('_frozen_inputs')
+        if inputs is None:
+            template = super(ChainableType, cls).__call__()
+            if template._propagation is None:
+                template._propagation = graph_for(template)
+            values = {}
+            for key, value in template.__dict__.items():
+                if key in cls._instance_attributes:
+                    continue
+                if key in cls._class_attributes or key.startswith('_const_') or (
+                        key.startswith('_Guard_') and key.endswith(('_unit', '_rng', '_doc'))):
+                    type.__setattr__(cls, key, value)
+                else:
+                    values[key] = value
+            cls._frozen_values = values
+            cls._links_shared = True
+            inputs = cls._frozen_inputs = dict.fromkeys(template._inputs, False)
+        return inputs
+
+
+class Chainable(metaclass=ChainableType):
     r""""
     A linked attribute class
     """
@@ -92,37 +215,23 @@ class Chainable:
         self._depended_on = {}
         self._linked_attributes = {}
         self._linked_attributes_args = {}
+        self._propagation = None
         self._state = []
         self._logistic_properties = []
+        self._inputs = {}
 
     def __setattr__(self, key, value):
-        upd = Message()
-        if isinstance(value, Message):  # Chain Message received
-            if (self, key) in value:
-                return
-            upd = value
-            value = None
-            sorted_transforms = self._get_sorted_functions(upd, self._linked_attributes_args[key])
-            for transform in sorted_transforms:
-                kwargs = {}
-                for arg, attr in self._linked_attributes[key][transform].items():
-                    logging.debug(attr)
-                    kwargs[arg] = getattr(attr[0], attr[1])
-                    if kwargs[arg] is None:
-                        break
-                if kwargs[arg] is None:
-                    continue
-                value = transform(**kwargs)
-                if value is not None:
-                    continue
-            if value is not None:
-                super(Chainable, self).__setattr__(key, value)
-                logging.debug('Transform set for {} -> {} with {}'.format(id(self), key, value))
-                self._send(key, upd)
-        else:
-            super(Chainable, self).__setattr__(key, value)
-            logging.debug('User set for {} -> {} with {}'.format(id(self), key, value))
-            self._send(key, upd)
+        super(Chainable, self).__setattr__(key, value)
+        _log.debug('User set for %s -> %s with %s', id(self), key, value)
+        if key[0] != '_' and self._inputs is not None:
+            self._inputs[key] = True
+        if self._dirty:
+            self._dirty.pop(key, None)
+        if (None, key) in getattr(self, '_depended_on', ()):
+            if self._batch is None:
+                self._propagate(key)
+            else:
+                self._batch.append(key)
 
     def __delattr__(self, item):
         super(Chainable, self).__delattr__(item)
@@ -138,10 +247,13 @@ class Chainable:
         return '<{} with state {}>'.format(str(self.__class__).split('.')[-1][:-2], state)
 
     def __call__(self, **kwargs):
-        state = deepcopy(self)
-        for key, value in kwargs.items():
-            if hasattr(state, key):
-                setattr(state, key, value)
+        if self._propagation is None:
+            self._propagation = graph_for(self)
+        if self._propagation.shared:
+            state = self._derive()
+        else:
+            state = deepcopy(self)
+        state.update(**{key: value for key, value in kwargs.items() if hasattr(state, key)})
         return state
 
     def __dir__(self):
@@ -150,9 +262,191 @@ class Chainable:
             _dir.remove(hide)
         return [d for d in [d for d in _dir if '_Guard_' not in d] if '_const_' not in d]
 
-    _hidden_dir = ['_linked_attributes', '_linked_attributes_args', '_depended_on', '_logistic_properties', '_state', '_version', '_hidden_dir']
+    _hidden_dir = ['_linked_attributes', '_linked_attributes_args', '_depended_on', '_propagation', '_links_shared',
+                   '_lazy', '_dirty', '_si', '_tracer', '_cache', '_tolerance', '_batch', '_logistic_properties',
+                   '_state', '_inputs', '_frozen_inputs', '_frozen_values', '_cited', '_version', '_hidden_dir']
+
+    _links_shared = False
+
+    _lazy = False
+
+    _dirty = None
+
+    _si = None
+
+    _tracer = None
+
+    _cache = None
+
+    _tolerance = 0.
+
+    _batch = None
+
+    _inputs = None
+
+    _frozen_inputs = None
+
+    _cited = False
+
+    @property
+    def lazy(self):
+        r"""
+        bool: Lazy evaluation of Linked attributes. When set, an assignment only marks the downstream attributes as
+        outdated. They are computed when read and kept until one of their upstream attributes changes. Instances
+        linked against other instances are always evaluated eagerly. """
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self, value):
+        self._lazy = value
+        if not value:
+            while self._dirty:
+                getattr(self, next(iter(self._dirty)))
+
+    @property
+    def fast(self):
+        r"""
+        bool: SI-magnitude fast path. When set, values are converted once to magnitudes in SI base units when they
+        are set, and propagation runs on those magnitudes with the SI kernels of the transforms (see
+        :mod:`mechmat.core.units`). Quantities are only rebuilt when a value is read. Transforms without a kernel
+        are evaluated with Quantities. """
+        return self._si is not None
+
+    @fast.setter
+    def fast(self, value):
+        if value and self._si is None:
+            si = {}
+            for guard in self._guards():
+                unit = getattr(self, guard.unit_name)
+                current = getattr(self, guard.guard_name)
+                if unit is not None and current is not None:
+                    si[guard.name] = to_si(current, unit)
+            self._si = si
+        elif not value and self._si is not None:
+            for name in list(self._si):
+                getattr(self, name)
+            self._si = None
+
+    def update(self, **kwargs):
+        r"""
+        Set multiple attributes with a single propagation pass, in which each downstream attribute is evaluated at
+        most once. The given attributes aren't recomputed from each other.
+
+        Args:
+            **kwargs: The attributes and their values
+        """
+        with self.batch():
+            for key, value in kwargs.items():
+                setattr(self, key, value)
+
+    @contextmanager
+    def batch(self):
+        r"""
+        Context manager deferring propagation. The linked attributes set within the context are propagated together
+        in a single pass when it exits, see :meth:`update`.
+
+        Returns:
+            The instance
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self.__dict__['_batch'] = []
+        try:
+            yield self
+        finally:
+            sources = sorted(set(self._batch))
+            self.__dict__['_batch'] = None
+            if sources:
+                self._propagate(sources[0] if len(sources) == 1 else tuple(sources))
+
+    @property
+    def tolerance(self):
+        r"""
+        float: Relative tolerance for change detection. When a transform recomputes a value within this tolerance of
+        the stored value, the attributes downstream of it aren't recomputed. The default of 0. requires equal values,
+        None disables change detection. """
+        return self._tolerance
+
+    @tolerance.setter
+    def tolerance(self, value):
+        self.__dict__['_tolerance'] = value
+
+    @property
+    def tracer(self):
+        r"""
+        :class:`~mechmat.core.tracing.Tracer`: Tracer recording the propagation of this instance and the states derived
+        from it, None to disable. See :func:`~mechmat.core.tracing.trace` to trace all instances. """
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, value):
+        self.__dict__['_tracer'] = value
+
+    @property
+    def cache(self):
+        r"""
+        :class:`~mechmat.core.memoization.TransformCache`: Cache memoizing the transforms evaluated by this instance
+        and the states derived from it, None to disable. See :func:`~mechmat.core.memoization.memoize` to memoize the
+        transforms of all instances. """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        self.__dict__['_cache'] = value
+
+    @classmethod
+    def _guards(cls):
+        r"""
+        All Guarded descriptors of the class
+        """
+        guards = {}
+        for base in reversed(cls.__mro__):
+            for name, attr in vars(base).items():
+                if isinstance(attr, Guarded):
+                    guards[name] = attr
+        return list(guards.values())
+
+    def _derive(self):
+        r"""
+        Derive a new state which shares the link graph, guard settings and values with this instance. Both instances
+        copy their link graph before modifying it, values are replaced on assignment and never modified in place.
+
+        Returns:
+            The derived state
+        """
+        state = self.__class__.__new__(self.__class__)
+        state.__dict__.update(self.__dict__)
+        state.__dict__['_links_shared'] = True
+        state.__dict__.pop('_batch', None)
+        if self._inputs is not None:
+            state.__dict__['_inputs'] = dict(self._inputs)
+        if self._dirty:
+            state.__dict__['_dirty'] = dict(self._dirty)
+        if self._si is not None:
+            state.__dict__['_si'] = dict(self._si)
+        self.__dict__['_links_shared'] = True
+        return state
+
+    def _own_links(self):
+        r"""
+        Copy the link graph shared with derived states before it is modified
+        """
+        if self._links_shared:
+            self.__dict__.update(_depended_on={key: set(value) for key, value in self._depended_on.items()},
+                                 _linked_attributes={attr: {transform: dict(args) for transform, args in
+                                                            transforms.items()}
+                                                     for attr, transforms in self._linked_attributes.items()},
+                                 _linked_attributes_args={attr: {transform: set(args) for transform, args in
+                                                                 transforms.items()}
+                                                          for attr, transforms in
+                                                          self._linked_attributes_args.items()},
+                                 _state=list(self._state),
+                                 _logistic_properties=list(self._logistic_properties),
+                                 _links_shared=False)
 
     def _tbl_writer(self, writer):
+        from pytablewriter import MarkdownTableWriter, LatexTableWriter
         writer.headers = ['Material Attribute', 'Value']
         tbl = []
         if isinstance(writer, MarkdownTableWriter) or isinstance(writer, LatexTableWriter):
@@ -173,30 +467,225 @@ class Chainable:
         return writer
 
     def _repr_markdown_(self):
+        from pytablewriter import MarkdownTableWriter
         writer = self._tbl_writer(MarkdownTableWriter())
         return writer.dumps()
 
     def _repr_html_(self):
+        from pytablewriter import HtmlTableWriter
         writer = self._tbl_writer(HtmlTableWriter())
         return writer.dumps()
 
     def _repr_latex_(self):
+        from pytablewriter import LatexTableWriter
         writer = self._tbl_writer(LatexTableWriter())
         return writer.dumps()
 
-    def _send(self, key, upd):
-        if (self, key) in self._depended_on:
-            upd.add((self, key))
-            for cls, attr in self._depended_on[(self, key)]:
-                logging.debug(cls)
-                setattr(cls, attr, upd)
+    def _propagate(self, key):
+        r"""
+        Execute the compiled propagation plan for a changed attribute. Each downstream attribute is evaluated at most
+        once, and only when one of its upstream attributes changed during this propagation, see :attr:`tolerance`. In
+        lazy mode the guarded downstream attributes are only marked as outdated. An attribute which is still outdated
+        from earlier assignments is marked with the combined plan of all their sources, so it is computed as after a
+        single :meth:`update` of those sources.
+
+        Args:
+            key (str, tuple): The changed attribute, or a sorted tuple of changed attributes
+        """
+        if self._propagation is None:
+            self._propagation = graph_for(self)
+        plan = self._propagation.plan(self, key)
+        tracer = self._tracer or tracing.active.get()
+        if self._lazy and self._propagation.shared:
+            if self._dirty is None:
+                self._dirty = {}
+            dirty = self._dirty
+            merged = {}
+            eager = []
+            for step in plan.steps:
+                if isinstance(getattr(self.__class__, step.attr, None), Guarded):
+                    outdated = dirty.get(step.attr)
+                    if outdated is None or outdated == key:
+                        dirty[step.attr] = key
+                    else:
+                        if outdated not in merged:
+                            merged[outdated] = _merge_sources(outdated, key)
+                        dirty[step.attr] = merged[outdated]
+                else:
+                    eager.append(step)
+            if tracer is None:
+                for step in eager:
+                    self._apply(step)
+            else:
+                root = tracer.begin(self, plan.name)
+                for step in eager:
+                    self._traced_apply(step, tracer, plan.name, 1, root)
+                tracer.end(root)
+            return
+        if tracer is not None:
+            self._propagate_traced(plan, tracer)
+            return
+        tolerance = self._tolerance
+        changed = set(plan.sources)
+        for step in plan.steps:
+            if changed.isdisjoint(step.depends):
+                continue
+            if tolerance is None:
+                if self._apply(step):
+                    changed.add(step.node)
+            else:
+                old = self._peek(step)
+                if self._apply(step) and not _equal(old, self._peek(step), tolerance):
+                    changed.add(step.node)
+
+    def _apply(self, step):
+        r"""
+        Evaluate the transforms of a propagation step in order of priority and set the value of the first transform
+        for which all arguments are known and which doesn't return None. On the fast path transforms with an SI kernel
+        are evaluated on magnitudes. With a transform cache, see :attr:`cache`, the results are memoized.
+
+        Args:
+            step (Step): The propagation step
 
-    def _argument_weight(self, visited, arg):
-        return len(visited.intersection(arg)) / len(arg)
+        Returns:
+            The transform which set the attribute, None when it isn't set
+        """
+        target = self if step.obj is None else step.obj
+        guard = getattr(target.__class__, step.attr, None)
+        fast = target._si is not None and isinstance(guard, Guarded) and getattr(target, guard.unit_name) is not None
+        cache = self._cache if self._cache is not None else memoization.active.get()
+        for transform, args in step.transforms:
+            kernel = kernel_of(transform) if fast else None
+            kwargs = {}
+            for arg, (obj, attr) in args:
+                source = self if obj is None else obj
+                kwargs[arg] = getattr(source, attr) if kernel is None else source._magnitude(attr)
+                if kwargs[arg] is None:
+                    break
+            else:
+                if kernel is None:
+                    value = transform(**kwargs) if cache is None else cache(transform, kwargs)
+                    if value is not None:
+                        super(Chainable, target).__setattr__(step.attr, value)
+                else:
+                    value = kernel(**kwargs) if cache is None else cache(kernel, kwargs)
+                    if value is not None:
+                        guard.set_magnitude(target, value)
+                if value is not None:
+                    _log.debug('Transform set for %s -> %s with %s', id(target), step.attr, value)
+                    return transform
+        return None
 
-    def _get_sorted_functions(self, visited, args):
-        return [transform[0] for transform in sorted(args.items(), key=lambda value: self._argument_weight(visited,
-                                                                                                           value[1]))]
+    def _propagate_traced(self, plan, tracer):
+        r"""
+        Execute a propagation plan as :meth:`_propagate` does, while recording each evaluated transform
+
+        Args:
+            plan (PropagationPlan): The propagation plan
+            tracer (Tracer): The tracer
+        """
+        root = tracer.begin(self, plan.name)
+        events = dict.fromkeys(plan.sources, root)
+        depths = dict.fromkeys(plan.sources, 0)
+        for step in plan.steps:
+            triggers = [node for node in step.depends if node in events]
+            if not triggers:
+                continue
+            trigger = max(triggers, key=lambda node: (depths[node], events[node]))
+            event = self._traced_apply(step, tracer, plan.name, depths[trigger] + 1, events[trigger])
+            if event is not None and (self._tolerance is None or tracer.events[event].changed):
+                events[step.node] = event
+                depths[step.node] = depths[trigger] + 1
+        tracer.end(root)
+
+    def _traced_apply(self, step, tracer, source, depth, parent):
+        r"""
+        Apply a propagation step and record it
+
+        Args:
+            step (Step): The propagation step
+            tracer (Tracer): The tracer
+            source (str): The attributes which triggered the propagation, separated by commas
+            depth (int): Distance to the triggering attribute
+            parent (int): Index of the event of the triggering attribute
+
+        Returns:
+            int: Index of the recorded event, None when the attribute isn't set
+        """
+        target = self if step.obj is None else step.obj
+        old = self._peek(step)
+        start = perf_counter()
+        transform = self._apply(step)
+        duration = perf_counter() - start
+        if transform is None:
+            return None
+        return tracer.record(tracing.TraceEvent(id(target), source, step.attr, transform, start, duration, depth,
+                                                parent, not _equal(old, self._peek(step), self._tolerance or 0.)))
+
+    def _peek(self, step):
+        r"""
+        The current value of the attribute set by a propagation step, as a magnitude in SI base units when it is
+        stored on the fast path
+
+        Args:
+            step (Step): The propagation step
+
+        Returns:
+            The value, None when the attribute isn't set
+        """
+        target = self if step.obj is None else step.obj
+        if target._si is not None and step.attr in target._si:
+            return target._si[step.attr]
+        return getattr(target, step.attr, None)
+
+    def _magnitude(self, attr):
+        r"""
+        The magnitude of an attribute in SI base units
+
+        Args:
+            attr (str): The attribute
+
+        Returns:
+            The magnitude, None when the attribute isn't set
+        """
+        if self._dirty and attr in self._dirty:
+            self._pull(attr)
+        if self._si is not None and attr in self._si:
+            return self._si[attr]
+        value = getattr(self, attr)
+        unit = getattr(self, '_Guard_{}_unit'.format(attr), None)
+        if value is not None and unit is not None:
+            return to_si(value, unit)
+        if isinstance(value, ureg.Quantity):
+            return to_si(value, value.u)
+        return value
+
+    def _pull(self, attr):
+        r"""
+        Compute an outdated attribute in lazy mode. Outdated arguments which precede the attribute in its propagation
+        plan, or which aren't set by it, are computed first. Arguments which follow it use their current value, as
+        they would during eager propagation.
+
+        Args:
+            attr (str): The outdated attribute
+        """
+        plan = self._propagation.plan(self, self._dirty.pop(attr))
+        step = plan.step(attr)
+        position = plan.position(attr)
+        for _, args in step.transforms:
+            for _, (obj, dep) in args:
+                if obj is None and dep in self._dirty and plan.position(dep) < position:
+                    self._pull(dep)
+        dirty = self._dirty
+        self.__dict__['_dirty'] = None
+        tracer = self._tracer or tracing.active.get()
+        try:
+            if tracer is None:
+                self._apply(step)
+            else:
+                self._traced_apply(step, tracer, plan.name, 1, None)
+        finally:
+            self.__dict__['_dirty'] = dirty
 
     def set_guard(self, attr, unit=None, rng=None, doc=None):
         r"""
@@ -209,8 +698,9 @@ class Chainable:
             doc (str): dosctring
         """
         if attr not in self._state and attr[0] != '_':
+            self._own_links()
             self._state.append(attr)
-        self._state.sort()
+            self._state.sort()
         setattr(self, '_Guard_{}_unit'.format(attr), unit)
         setattr(self, '_Guard_{}_doc'.format(attr), '{}. {} should be given in {}'.format(doc, attr, unit))
         if rng is not None and not isinstance(rng, ureg.Quantity) and unit is not None:
@@ -228,6 +718,7 @@ class Chainable:
             **kwargs: the transform function keywords where the value is either a str (if the attribute can be obtained
              from the own instance) or a tuple containing the other instance and attribute name.
         """
+        self._own_links()
         if attr not in self._linked_attributes:
             self._linked_attributes[attr] = {}
             self._linked_attributes_args[attr] = {}
@@ -242,23 +733,40 @@ class Chainable:
                 cls = depend[0]
                 dep = depend[1]
             if not isinstance(dep, str) or not hasattr(cls, dep):
-                dep_name = '_const_{}'.format(hash((cls, dep)))
+                dep_name = '_const_{}'.format(hash((attr, transform, arg)))
                 setattr(cls, dep_name, dep)
                 dep = dep_name
+            # links against the own instance are stored as None, which allows derived states to share the link graph
             if hasattr(cls, '_depended_on'):
-                if (cls, dep) not in getattr(cls, '_depended_on'):
-                    getattr(cls, '_depended_on')[(cls, dep)] = set()
-                getattr(cls, '_depended_on')[(cls, dep)].add((self, attr))
-            self._linked_attributes[attr][transform][arg] = (cls, dep)
-            self._linked_attributes_args[attr][transform].add((cls, dep))
+                cls._own_links()
+                if (None, dep) not in getattr(cls, '_depended_on'):
+                    getattr(cls, '_depended_on')[(None, dep)] = set()
+                getattr(cls, '_depended_on')[(None, dep)].add((None if cls is self else self, attr))
+                cls._propagation = None
+            node = (None if cls is self else cls, dep)
+            self._linked_attributes[attr][transform][arg] = node
+            self._linked_attributes_args[attr][transform].add(node)
 
     def unlink_attr(self, attr, transform):
-        # Todo implement
-        for key, value in self._linked_attributes[attr][transform].items():
-            pass
+        r"""
+        Remove a transform from a Linked attribute.
 
+        Args:
+            attr (str): Attribute name
+            transform: The function which provides the transform.
+        """
+        self._own_links()
         del self._linked_attributes[attr][transform]
-        del self._linked_attributes_args[attr][transform]
+        removed = self._linked_attributes_args[attr].pop(transform)
+        for args in self._linked_attributes_args[attr].values():
+            removed = removed.difference(args)
+        for cls, dep in removed:
+            cls = self if cls is None else cls
+            if hasattr(cls, '_depended_on'):
+                cls._own_links()
+                getattr(cls, '_depended_on')[(None, dep)].discard((None if cls is self else self, attr))
+                cls._propagation = None
+        self._propagation = None
 
     def linked_transforms(self, attr):
         return dict(zip(self._linked_attributes[attr].keys(),
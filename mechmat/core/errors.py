@@ -12,5 +12,8 @@ class OutOfRangeError(ValueError):
         self.rng = rng
         self.property = property
 
+    def __reduce__(self):
+        return self.__class__, (self.value, self.rng, self.property)
+
     def __str__(self):
         return "Setting the material attribute {} with{} is out of range {}".format(self.property, self.value, self.rng)
@@ -0,0 +1,65 @@
+r"""
+Deferred setup of optional dependencies.
+
+Some integrations, such as the matplotlib support of pint, only need to be set up when the user imports the
+dependency. :func:`when_imported` runs a callback right after a module is imported, or immediately when it is
+already imported, so importing mechmat doesn't import the dependency itself.
+"""
+
+import sys
+from importlib.abc import Loader, MetaPathFinder
+from importlib.util import find_spec
+
+__all__ = ['when_imported']
+
+
+class _CallbackLoader(Loader):
+    def __init__(self, loader, callbacks):
+        self._loader = loader
+        self._callbacks = callbacks
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        for callback in self._callbacks:
+            callback(module)
+
+
+class _PostImportFinder(MetaPathFinder):
+    def __init__(self):
+        self.callbacks = {}
+        self._searching = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.callbacks or fullname in self._searching:
+            return None
+        self._searching.add(fullname)
+        try:
+            spec = find_spec(fullname)
+        finally:
+            self._searching.discard(fullname)
+        if spec is None or spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+        spec.loader = _CallbackLoader(spec.loader, self.callbacks.pop(fullname))
+        return spec
+
+
+_finder = _PostImportFinder()
+
+
+def when_imported(name, callback):
+    r"""
+    Call a function once a module is imported
+
+    Args:
+        name (str): The name of the module
+        callback: Function receiving the module, it is called immediately when the module is already imported
+    """
+    if name in sys.modules:
+        callback(sys.modules[name])
+        return
+    if _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+    _finder.callbacks.setdefault(name, []).append(callback)
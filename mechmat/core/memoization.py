@@ -0,0 +1,162 @@
+r"""
+Memoization of the transforms of linked attributes.
+
+The transforms in :mod:`mechmat.principal` are pure functions of their arguments, so a transform evaluated again
+with arguments it has seen before can return the earlier result. A :class:`TransformCache` stores the results of
+the transforms evaluated during propagation, keyed on their arguments as magnitudes in SI base units, such that the
+same state given in different units hits the same entry. Caches are attached to a single instance, and the states
+derived from it, with :attr:`~mechmat.core.chainable.Chainable.cache`, or to all instances used in the current thread or
+asynchronous task with :func:`memoize`::
+
+    with memoize(maxsize=256) as cache:
+        for shear_rate in shear_rates:
+            mat.update(temperature=temperature, shear_rate=shear_rate)
+    print(cache.stats())
+
+Memoization is opt-in, without a cache the transforms are always evaluated. Arguments which can't be hashed, and
+arrays with more elements than :attr:`TransformCache.max_elements`, bypass the cache. The SI kernels evaluated on the
+fast path (see :attr:`~mechmat.core.chainable.Chainable.fast`) cost about as much as a lookup, memoization pays off for
+transforms evaluated with Quantities.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from numpy import ndarray
+
+from mechmat import ureg
+from .tracing import transform_name
+from .units import si_conversion, to_si
+
+__all__ = ['TransformCache', 'memoize', 'active']
+
+active = ContextVar('active', default=None)
+r"""ContextVar: The cache attached to all instances in the current context, None when memoization is disabled"""
+
+
+class TransformCache:
+    r"""
+    Bounded cache of transform results
+
+    Args:
+        maxsize (int): Maximum number of results in the cache
+        policy (str): Eviction policy when the cache is full, 'lru' evicts the least recently used result and 'fifo'
+         the oldest result
+        max_elements (int): Arrays with more elements bypass the cache
+    """
+
+    def __init__(self, maxsize=1024, policy='lru', max_elements=1024):
+        if policy not in ('lru', 'fifo'):
+            raise ValueError('Unknown eviction policy {}'.format(policy))
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_elements = max_elements
+        self._results = OrderedDict()
+        self._stats = {}
+
+    def clear(self):
+        r"""
+        Remove all results and statistics
+        """
+        self._results.clear()
+        self._stats.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+    def _canonical(self, value):
+        if isinstance(value, ureg.Quantity):
+            return si_conversion(value._units)[0]._units, self._canonical(to_si(value._magnitude, value._units))
+        if isinstance(value, ndarray):
+            if value.size > self.max_elements:
+                raise TypeError('Array too large to memoize')
+            if value.ndim == 0:
+                return value.item()
+            return value.shape, value.dtype.str, value.tobytes()
+        hash(value)
+        return value
+
+    def key(self, transform, kwargs):
+        r"""
+        The key of a transform and its arguments
+
+        Args:
+            transform: The transform
+            kwargs (dict): The arguments
+
+        Returns:
+            The hashable key, None when the arguments can't be memoized
+        """
+        try:
+            return (transform,) + tuple(sorted((arg, self._canonical(value)) for arg, value in kwargs.items()))
+        except TypeError:
+            return None
+
+    def __call__(self, transform, kwargs):
+        r"""
+        Evaluate a transform, or return its memoized result
+
+        Args:
+            transform: The transform
+            kwargs (dict): The arguments
+
+        Returns:
+            The result of the transform
+        """
+        stats = self._stats.get(transform)
+        if stats is None:
+            stats = self._stats[transform] = [0, 0]
+        key = self.key(transform, kwargs)
+        if key is None:
+            stats[1] += 1
+            return transform(**kwargs)
+        try:
+            value = self._results[key]
+        except KeyError:
+            stats[1] += 1
+            value = transform(**kwargs)
+            self._results[key] = value
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+            return value
+        stats[0] += 1
+        if self.policy == 'lru':
+            self._results.move_to_end(key)
+        return value
+
+    def stats(self):
+        r"""
+        The hits and misses per transform
+
+        Returns:
+            dict of the transform names and a tuple of the number of hits and misses
+        """
+        return {transform_name(transform): tuple(counts) for transform, counts in self._stats.items()}
+
+    def __repr__(self):
+        hits = sum(counts[0] for counts in self._stats.values())
+        misses = sum(counts[1] for counts in self._stats.values())
+        return '<TransformCache with {} of {} results, {} hits and {} misses>'.format(len(self), self.maxsize, hits,
+                                                                                      misses)
+
+
+@contextmanager
+def memoize(cache=None, maxsize=1024, policy='lru'):
+    r"""
+    Context manager attaching a transform cache to all instances, within the current thread or asynchronous task
+
+    Args:
+        cache (TransformCache): The cache, a new cache with the given size and policy when None
+        maxsize (int): Maximum number of results of a new cache
+        policy (str): Eviction policy of a new cache, see :class:`TransformCache`
+
+    Returns:
+        The attached :class:`TransformCache`
+    """
+    cache = TransformCache(maxsize=maxsize, policy=policy) if cache is None else cache
+    token = active.set(cache)
+    try:
+        yield cache
+    finally:
+        active.reset(token)
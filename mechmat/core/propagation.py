@@ -0,0 +1,271 @@
+r"""
+Compiled propagation of linked attributes.
+
+The links declared with :meth:`~mechmat.core.chainable.Chainable.link_attr` form a directed graph between attributes.
+Instead of walking that graph recursively on every assignment, the part of the graph downstream of an attribute is
+compiled once into a :class:`PropagationPlan`: a flat list of steps in dependency order, which is executed without
+recursion or sorting. A plan can have multiple source attributes, which are set together and propagated in a single
+pass.
+
+Plans are cached in a :class:`PropagationGraph`. Instances of the same class with an identical link graph share a
+single graph, so each plan is compiled only once per material class. The sources of the transforms of a plan are
+cited when the plan is first requested, see :mod:`mechmat.core.bibliography`.
+"""
+
+from collections import deque
+
+from . import bibliography
+
+__all__ = ['PropagationGraph', 'PropagationPlan', 'Step', 'graph_for']
+
+
+class Step:
+    r"""
+    A single node of a propagation plan
+
+    Args:
+        obj: The instance owning the attribute, None when it is the instance on which the plan is executed
+        attr (str): The attribute to be set
+        transforms (tuple): Tuples of (transform, args) in descending priority, where args is a tuple of
+         (keyword, (obj, attribute)) pairs
+        depends (frozenset): Nodes of the same plan upon which the step depends
+    """
+
+    __slots__ = ('obj', 'attr', 'node', 'transforms', 'depends')
+
+    def __init__(self, obj, attr, transforms, depends):
+        self.obj = obj
+        self.attr = attr
+        self.node = (obj, attr)
+        self.transforms = transforms
+        self.depends = depends
+
+    def __repr__(self):
+        return '<Step {}>'.format(self.attr)
+
+
+class PropagationPlan:
+    r"""
+    Ordered evaluation plan of all attributes downstream of the source attributes
+
+    Args:
+        sources (tuple): The (obj, attribute) nodes which trigger the plan
+        steps (tuple): :class:`Step` instances in evaluation order
+    """
+
+    __slots__ = ('sources', 'steps', 'cited', '_index')
+
+    def __init__(self, sources, steps):
+        self.sources = sources
+        self.steps = steps
+        self.cited = False
+        self._index = {step.attr: i for i, step in enumerate(steps) if step.obj is None}
+
+    def cite(self):
+        r"""
+        Cite the sources of the transforms of the plan, when citations are recorded
+        """
+        if bibliography.enabled.get():
+            bibliography.cite_sources(*(transform for step in self.steps for transform, _ in step.transforms))
+            self.cited = True
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def step(self, attr):
+        r"""
+        The step setting an attribute of the instance on which the plan is executed
+
+        Args:
+            attr (str): The attribute
+
+        Returns:
+            :class:`Step`
+        """
+        return self.steps[self._index[attr]]
+
+    def position(self, attr):
+        r"""
+        The position of an attribute of the instance on which the plan is executed
+
+        Args:
+            attr (str): The attribute
+
+        Returns:
+            int: The index of the step, or -1 when the attribute isn't set by the plan
+        """
+        return self._index.get(attr, -1)
+
+    @property
+    def name(self):
+        r"""
+        str: The source attributes separated by commas
+        """
+        return ', '.join(attr for _, attr in self.sources)
+
+    def __repr__(self):
+        return '<PropagationPlan {} -> {}>'.format(self.name, [s.attr for s in self.steps])
+
+
+class PropagationGraph:
+    r"""
+    Cache of compiled propagation plans for a link graph
+
+    Nodes are (obj, attribute) tuples, where obj is None for the instance on which a plan is executed. A graph which
+    only links attributes of its own instance is shared between all instances of a class, a graph linked against
+    other instances is private to a single instance.
+
+    Args:
+        shared (bool): Whether the graph is shared between instances
+    """
+
+    def __init__(self, shared=True):
+        self.shared = shared
+        self._plans = {}
+
+    def __deepcopy__(self, memo):
+        # A private graph refers to the original instances, a copy needs to compile its own
+        return self if self.shared else None
+
+    def __reduce__(self):
+        return type(None), ()
+
+    def plan(self, instance, attr):
+        r"""
+        The propagation plan of an attribute, compiled on first request
+
+        Args:
+            instance (Chainable): The instance on which the plan is executed
+            attr (str, tuple): The source attribute, or a sorted tuple of source attributes
+
+        Returns:
+            :class:`PropagationPlan`
+        """
+        try:
+            plan = self._plans[attr]
+        except KeyError:
+            plan = compile_plan(instance, attr)
+            self._plans[attr] = plan
+        if not plan.cited:
+            plan.cite()
+        return plan
+
+
+def _relative(instance, owner, node):
+    # Links store the owning instance as None, plans store the instance on which they are executed as None
+    obj = owner if node[0] is None else node[0]
+    return None if obj is instance else obj, node[1]
+
+
+def _dependents(instance, node):
+    owner = instance if node[0] is None else node[0]
+    dependents = getattr(owner, '_depended_on', {}).get((None, node[1]), ())
+    return sorted((_relative(instance, owner, n) for n in dependents), key=lambda n: n[1])
+
+
+def compile_plan(instance, attr):
+    r"""
+    Compile the propagation plan for one or more attributes.
+
+    All attributes reachable from the sources are evaluated exactly once, the sources themselves are never
+    recomputed. An attribute is placed as soon as one of its transforms depends on the sources and has all its
+    arguments up to date, i.e. not evaluated later in the plan. Cycles in the link graph which can't be resolved that
+    way are broken at the attribute closest to a source. When an attribute has multiple transforms, the transform with
+    the largest fraction of up to date arguments takes precedence. Ties are decided by the fraction of arguments
+    evaluated earlier in the plan.
+
+    Args:
+        instance (Chainable): The instance from which the link graph is read
+        attr (str, tuple): The source attribute, or a tuple of source attributes
+
+    Returns:
+        :class:`PropagationPlan`
+    """
+    sources = tuple((None, a) for a in ((attr,) if isinstance(attr, str) else attr))
+
+    distance = dict.fromkeys(sources, 0)
+    edges = {}
+    queue = deque(sources)
+    while queue:
+        node = queue.popleft()
+        edges[node] = [n for n in _dependents(instance, node) if n not in sources]
+        for dependent in edges[node]:
+            if dependent not in distance:
+                distance[dependent] = distance[node] + 1
+                queue.append(dependent)
+
+    remaining = [n for n in distance if n not in sources]
+    stale = {}
+    for node in remaining:
+        owner = instance if node[0] is None else node[0]
+        stale[node] = [set(_relative(instance, owner, n) for n in kwargs.values()).intersection(distance)
+                       for kwargs in getattr(owner, '_linked_attributes', {}).get(node[1], {}).values()]
+    placed = set(sources)
+    order = []
+    while len(order) < len(remaining):
+        unplaced = [n for n in remaining if n not in placed]
+        node = next((n for n in unplaced if any(args and args <= placed for args in stale[n])), None)
+        if node is None:
+            node = min(unplaced, key=lambda n: distance[n])
+        placed.add(node)
+        order.append(node)
+
+    steps = []
+    visited = set(sources)
+    for node in order:
+        owner = instance if node[0] is None else node[0]
+        weighted = []
+        depends = set()
+        for transform, kwargs in getattr(owner, '_linked_attributes', {}).get(node[1], {}).items():
+            args = tuple((arg, _relative(instance, owner, n)) for arg, n in kwargs.items())
+            arg_nodes = set(a[1] for a in args)
+            if arg_nodes:
+                weight = (1. - len(arg_nodes.intersection(distance).difference(visited)) / len(arg_nodes),
+                          len(visited.intersection(arg_nodes)) / len(arg_nodes))
+            else:
+                weight = (0., 0.)
+            weighted.append((weight, transform, args))
+            depends.update(arg_nodes.intersection(distance))
+        visited.add(node)
+        if weighted:
+            weighted.sort(key=lambda w: w[0])
+            transforms = tuple((t, a) for _, t, a in reversed(weighted))
+            steps.append(Step(node[0], node[1], transforms, frozenset(depends)))
+    return PropagationPlan(sources, tuple(steps))
+
+
+_graphs = {}
+
+
+def graph_for(instance):
+    r"""
+    The propagation graph of an instance. Instances which only link against their own attributes share the graph
+    with all instances of their class with the same links.
+
+    Args:
+        instance (Chainable): The instance
+
+    Returns:
+        :class:`PropagationGraph`
+    """
+    signature = []
+    for attr, transforms in instance._linked_attributes.items():
+        for transform, kwargs in transforms.items():
+            for arg, (obj, dep) in kwargs.items():
+                if obj is not None:
+                    return PropagationGraph(shared=False)
+                signature.append((attr, transform, arg, dep))
+    for dependents in instance._depended_on.values():
+        for obj, _ in dependents:
+            if obj is not None:
+                return PropagationGraph(shared=False)
+    key = (type(instance), tuple(signature))
+    try:
+        return _graphs[key]
+    except KeyError:
+        graph = PropagationGraph(shared=True)
+        _graphs[key] = graph
+        return graph
@@ -0,0 +1,205 @@
+r"""
+Tracing of the propagation of linked attributes.
+
+A :class:`Tracer` records every transform evaluated during propagation, with its source attribute, wall time, call
+depth and whether it changed the value. Tracers are attached to a single instance with
+:attr:`~mechmat.core.chainable.Chainable.tracer`, or to all instances used in the current thread or asynchronous task
+with :func:`trace`::
+
+    with trace() as tracer:
+        mat.pressure = 80. * ureg.MPa
+    print(tracer.folded())
+
+When no tracer is attached propagation runs its untraced path, tracing adds no overhead.
+
+The depth of a transform is its distance to the changed attribute in the link graph: its parent is the deepest
+changed upstream attribute which triggered it. The recorded events can be exported as a call tree, as totals per
+transform or in the folded stack format read by flamegraph tools.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+__all__ = ['TraceEvent', 'Tracer', 'trace', 'active', 'transform_name']
+
+active = ContextVar('active', default=None)
+r"""ContextVar: The tracer attached to all instances in the current context, None when tracing is disabled"""
+
+
+def transform_name(transform):
+    r"""
+    A readable name of a transform
+
+    Args:
+        transform: The transform
+
+    Returns:
+        str: The module and name of the transform
+    """
+    if transform is None:
+        return None
+    name = getattr(transform, '__name__', repr(transform))
+    module = getattr(transform, '__module__', None)
+    return name if module is None else '{}.{}'.format(module.split('.')[-1], name)
+
+
+class TraceEvent:
+    r"""
+    A single recorded step of a propagation
+
+    Args:
+        instance (int): The id of the instance on which the attribute is set
+        source (str): The attributes which triggered the propagation, separated by commas
+        attr (str): The attribute which is set
+        transform: The evaluated transform, None for the assignment which triggered the propagation
+        start (float): Performance counter at the start of the evaluation in seconds
+        duration (float): Wall time of the evaluation in seconds
+        depth (int): Distance to the triggering assignment
+        parent (int): Index of the parent event, None for the assignment which triggered the propagation
+        changed (bool): Whether the value of the attribute changed
+    """
+
+    __slots__ = ('instance', 'source', 'attr', 'transform', 'start', 'duration', 'depth', 'parent', 'changed')
+
+    def __init__(self, instance, source, attr, transform, start, duration, depth, parent, changed):
+        self.instance = instance
+        self.source = source
+        self.attr = attr
+        self.transform = transform
+        self.start = start
+        self.duration = duration
+        self.depth = depth
+        self.parent = parent
+        self.changed = changed
+
+    def __repr__(self):
+        return '<TraceEvent {} -> {} {:.1f} us>'.format(self.source, self.attr, self.duration * 1e6)
+
+
+class Tracer:
+    r"""
+    Recorder of propagation events
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def clear(self):
+        r"""
+        Remove all recorded events
+        """
+        self.events = []
+
+    def begin(self, instance, source):
+        r"""
+        Record the assignment which triggers a propagation
+
+        Args:
+            instance: The instance on which the attribute is set
+            source (str): The attribute
+
+        Returns:
+            int: Index of the event
+        """
+        self.events.append(TraceEvent(id(instance), source, source, None, perf_counter(), 0., 0, None, True))
+        return len(self.events) - 1
+
+    def end(self, index):
+        r"""
+        Finish the propagation started with :meth:`begin`, its duration is the wall time of the whole propagation
+
+        Args:
+            index (int): Index of the event returned by :meth:`begin`
+        """
+        event = self.events[index]
+        event.duration = perf_counter() - event.start
+
+    def record(self, event):
+        r"""
+        Record the evaluation of a transform
+
+        Args:
+            event (TraceEvent): The event
+
+        Returns:
+            int: Index of the event
+        """
+        self.events.append(event)
+        return len(self.events) - 1
+
+    def _children(self):
+        children = {}
+        for i, event in enumerate(self.events):
+            children.setdefault(event.parent, []).append(i)
+        return children
+
+    def call_tree(self):
+        r"""
+        The recorded events as a tree
+
+        Returns:
+            list: A dictionary per propagation with the keys attr, transform, duration, changed and children, where
+            children is a list of dictionaries of the same form
+        """
+        children = self._children()
+
+        def node(i):
+            event = self.events[i]
+            return {'attr': event.attr, 'transform': transform_name(event.transform), 'duration': event.duration,
+                    'changed': event.changed, 'children': [node(c) for c in children.get(i, [])]}
+
+        return [node(i) for i in children.get(None, [])]
+
+    def folded(self):
+        r"""
+        The recorded transforms in the folded stack format used by flamegraph tools, one line per call path with
+        its total wall time in microseconds
+
+        Returns:
+            str: The folded stacks
+        """
+        totals = {}
+        stacks = {}
+        for i, event in enumerate(self.events):
+            frame = event.attr if event.transform is None else '{} ({})'.format(event.attr,
+                                                                                transform_name(event.transform))
+            stacks[i] = frame if event.parent is None else '{};{}'.format(stacks[event.parent], frame)
+            if event.transform is not None:
+                totals[stacks[i]] = totals.get(stacks[i], 0.) + event.duration
+        return '\n'.join('{} {}'.format(stack, int(round(total * 1e6))) for stack, total in totals.items())
+
+    def totals(self):
+        r"""
+        Total wall time and number of evaluations per attribute and transform, slowest first
+
+        Returns:
+            list: Tuples of (attr, transform name, total duration in seconds, count)
+        """
+        totals = {}
+        for event in self.events:
+            if event.transform is None:
+                continue
+            key = (event.attr, transform_name(event.transform))
+            duration, count = totals.get(key, (0., 0))
+            totals[key] = (duration + event.duration, count + 1)
+        return sorted(((k[0], k[1], d, c) for k, (d, c) in totals.items()), key=lambda t: t[2], reverse=True)
+
+
+@contextmanager
+def trace(tracer=None):
+    r"""
+    Context manager attaching a tracer to all instances, within the current thread or asynchronous task
+
+    Args:
+        tracer (Tracer): The tracer, a new tracer when None
+
+    Returns:
+        The attached :class:`Tracer`
+    """
+    tracer = Tracer() if tracer is None else tracer
+    token = active.set(tracer)
+    try:
+        yield tracer
+    finally:
+        active.reset(token)
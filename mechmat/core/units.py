@@ -0,0 +1,130 @@
+r"""
+SI-magnitude fast path.
+
+Pint performs unit algebra on every operation, which costs far more than the arithmetic itself. On the fast path
+values are converted once to magnitudes in SI base units when they are set, propagation runs on those raw floats or
+arrays through SI kernels of the transforms, and Quantities are only rebuilt when a value is read.
+
+Conversions between a unit and its SI base units are linear (:math:`m_{SI} = a m + b`). The factors are determined
+once per unit, after which a conversion is plain arithmetic.
+"""
+
+from pint import DimensionalityError
+
+from mechmat import ureg
+
+__all__ = ['unit_agnostic', 'si_kernel', 'kernel_of', 'si_conversion', 'to_si', 'from_si']
+
+_kernels = {}
+_conversions = {}
+_value_conversions = {}
+
+
+def unit_agnostic(transform):
+    r"""
+    Decorator marking a transform as valid for magnitudes in SI base units, it is its own SI kernel
+
+    Args:
+        transform: The transform
+
+    Returns:
+        The transform
+    """
+    _kernels[transform] = transform
+    return transform
+
+
+def si_kernel(transform):
+    r"""
+    Decorator registering a function as the SI kernel of a transform. The kernel receives the same keywords as the
+    transform as magnitudes in SI base units and returns the magnitude of the result in SI base units.
+
+    Args:
+        transform: The transform which is replaced by the kernel on the fast path
+
+    Returns:
+        The decorator
+    """
+
+    def register(kernel):
+        _kernels[transform] = kernel
+        return kernel
+
+    return register
+
+
+def kernel_of(transform):
+    r"""
+    The SI kernel of a transform
+
+    Args:
+        transform: The transform
+
+    Returns:
+        The kernel or None when the transform has no kernel
+    """
+    return _kernels.get(transform)
+
+
+def si_conversion(unit):
+    r"""
+    The linear conversion of a unit to its SI base units
+
+    Args:
+        unit: The unit
+
+    Returns:
+        tuple of the base units, scale and offset, such that :math:`m_{SI} = scale \cdot m + offset`
+    """
+    key = getattr(unit, '_units', unit)
+    try:
+        return _conversions[key]
+    except KeyError:
+        zero = ureg.Quantity(0., unit).to_base_units()
+        one = ureg.Quantity(1., unit).to_base_units()
+        conversion = (one.u, one.m - zero.m, zero.m)
+        _conversions[key] = conversion
+        return conversion
+
+
+def to_si(value, unit):
+    r"""
+    The magnitude of a value in SI base units
+
+    Args:
+        value: A Quantity, or a magnitude in unit
+        unit: The unit in which the value is expected
+
+    Returns:
+        The magnitude in the SI base units of unit
+    """
+    if isinstance(value, ureg.Quantity):
+        key = (value._units, getattr(unit, '_units', unit))
+        try:
+            scale, offset = _value_conversions[key]
+        except KeyError:
+            value_base, scale, offset = si_conversion(value.u)
+            if value_base != si_conversion(unit)[0]:
+                raise DimensionalityError(value.u, unit)
+            _value_conversions[key] = (scale, offset)
+        value = value.m
+    else:
+        _, scale, offset = si_conversion(unit)
+    if offset:
+        return value * scale + offset
+    return value * scale if scale != 1. else value
+
+
+def from_si(magnitude, unit):
+    r"""
+    A Quantity from a magnitude in SI base units
+
+    Args:
+        magnitude: The magnitude in the SI base units of unit
+        unit: The unit of the Quantity
+
+    Returns:
+        The Quantity in unit
+    """
+    _, scale, offset = si_conversion(unit)
+    return ureg.Quantity((magnitude - offset) / scale, unit)
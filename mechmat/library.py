@@ -0,0 +1,216 @@
+r"""
+Libraries of many materials on disk.
+
+A :class:`Library` is a directory with an ``index.json`` and the materials in the compact format of
+:mod:`mechmat.serialization`. The materials are either appended to a single archive file or stored as a file per
+material. The index maps the name, short name and CAS number of every material to the file, byte offset and length
+of its record, so a lookup only reads the index and the record of the material itself::
+
+    library = Library.create('resins', materials)
+    pla = Library('resins').find(CAS='26100-51-6')[0]
+
+Loaded materials are cached by the library. :meth:`Library.load_all` loads all materials in parallel over a process
+pool.
+"""
+
+import json
+import os
+from io import BytesIO
+from multiprocessing import get_context
+
+from mechmat import serialization
+
+__all__ = ['Library']
+
+FORMAT = 'mechmat-library'
+VERSION = 1
+
+_ARCHIVE = 'materials.bin'
+_FIELDS = ('name', 'short_name', 'CAS')
+
+
+def _read(path, entry):
+    with open(os.path.join(path, entry['file']), 'rb') as f:
+        f.seek(entry['offset'])
+        return serialization.load(BytesIO(f.read(entry['length'])))[0]
+
+
+def _read_all(task):
+    path, entries = task
+    return [_read(path, entry) for entry in entries]
+
+
+class Library:
+    r"""
+    Materials stored on disk, loaded on lookup
+
+    Args:
+        path (str): The directory of the library, as written by :meth:`create`
+
+    Raises:
+        ValueError: When the directory isn't a material library
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'index.json')) as f:
+            index = json.load(f)
+        if index.get('format') != FORMAT or index.get('version', VERSION + 1) > VERSION:
+            raise ValueError('{} is not a material library of version {} or earlier'.format(path, VERSION))
+        self.entries = index['entries']
+        self._lookup = {field: {} for field in _FIELDS}
+        for i, entry in enumerate(self.entries):
+            for field in _FIELDS:
+                if entry[field] is not None:
+                    self._lookup[field].setdefault(entry[field], []).append(i)
+        self._cache = {}
+
+    @classmethod
+    def create(cls, path, materials, archive=True):
+        r"""
+        Write materials to a new library
+
+        Args:
+            path (str): The directory of the library, it is created when it doesn't exist
+            materials: Iterable of materials
+            archive (bool): Append the materials to a single archive, instead of writing a file per material
+
+        Returns:
+            The :class:`Library`
+        """
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        if archive:
+            with open(os.path.join(path, _ARCHIVE), 'wb') as f:
+                for material in materials:
+                    entries.append(cls._write(f, _ARCHIVE, material))
+        else:
+            for i, material in enumerate(materials):
+                name = '{:06d}.npz'.format(i)
+                with open(os.path.join(path, name), 'wb') as f:
+                    entries.append(cls._write(f, name, material))
+        cls._write_index(path, entries)
+        return cls(path)
+
+    @staticmethod
+    def _write(f, name, material):
+        record = BytesIO()
+        serialization.dump(material, record)
+        entry = {field: getattr(material, field) for field in _FIELDS}
+        entry.update(file=name, offset=f.tell(), length=f.write(record.getvalue()))
+        return entry
+
+    @staticmethod
+    def _write_index(path, entries):
+        with open(os.path.join(path, 'index.json'), 'w') as f:
+            json.dump({'format': FORMAT, 'version': VERSION, 'entries': entries}, f, indent=1)
+
+    def add(self, material):
+        r"""
+        Append a material to the archive of the library and to its index
+
+        Args:
+            material: The material
+        """
+        with open(os.path.join(self.path, _ARCHIVE), 'ab') as f:
+            entry = self._write(f, _ARCHIVE, material)
+        for field in _FIELDS:
+            if entry[field] is not None:
+                self._lookup[field].setdefault(entry[field], []).append(len(self.entries))
+        self.entries.append(entry)
+        self._cache[len(self.entries) - 1] = material
+        self._write_index(self.path, self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self._lookup['name']
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.load(i)
+
+    def load(self, index):
+        r"""
+        A material of the library, it is read from disk on first access and cached
+
+        Args:
+            index (int): The position of the material in the index
+
+        Returns:
+            The material
+        """
+        if index not in self._cache:
+            self._cache[index] = _read(self.path, self.entries[index])
+        return self._cache[index]
+
+    def find(self, name=None, short_name=None, CAS=None):
+        r"""
+        The materials matching all given fields, only the matching materials are read
+
+        Args:
+            name (str): The name of the material
+            short_name (str): The short name of the material
+            CAS (str): The Chemical Abstracts Service number of the material
+
+        Returns:
+            list of the materials
+        """
+        matches = None
+        for field, value in zip(_FIELDS, (name, short_name, CAS)):
+            if value is not None:
+                indices = set(self._lookup[field].get(value, ()))
+                matches = indices if matches is None else matches & indices
+        if matches is None:
+            matches = range(len(self))
+        return [self.load(i) for i in sorted(matches)]
+
+    def __getitem__(self, name):
+        r"""
+        The first material with a name
+
+        Args:
+            name (str): The name of the material
+
+        Returns:
+            The material
+
+        Raises:
+            KeyError: When the library has no material with this name
+        """
+        return self.load(self._lookup['name'][name][0])
+
+    def load_all(self, processes=None, chunksize=64):
+        r"""
+        Load all materials which aren't cached yet, in parallel over a process pool
+
+        Args:
+            processes (int): Number of worker processes, defaults to the number of CPUs. With 1 the materials are
+             loaded in this process
+            chunksize (int): Number of materials loaded by a worker at once
+
+        Returns:
+            list of all materials, in the order of the index
+        """
+        missing = [i for i in range(len(self)) if i not in self._cache]
+        chunks = [missing[i:i + chunksize] for i in range(0, len(missing), chunksize)]
+        tasks = [(self.path, [self.entries[i] for i in chunk]) for chunk in chunks]
+        if processes == 1 or len(tasks) <= 1:
+            results = map(_read_all, tasks)
+            for chunk, materials in zip(chunks, results):
+                self._cache.update(zip(chunk, materials))
+        else:
+            with get_context().Pool(processes) as pool:
+                for chunk, materials in zip(chunks, pool.imap(_read_all, tasks)):
+                    self._cache.update(zip(chunk, materials))
+        return [self._cache[i] for i in range(len(self))]
+
+    def clear_cache(self):
+        r"""
+        Remove the loaded materials from the cache
+        """
+        self._cache.clear()
+
+    def __repr__(self):
+        return '<Library of {} materials at {}>'.format(len(self), self.path)
@@ -6,9 +6,11 @@ from mechmat.properties.viscosity import Viscosity
 from mechmat.properties.shearing import Shearing
 from mechmat.properties.flow import Flow
 from mechmat.core.chainable import Chainable
-import dill as _dill
+from mechmat.core.propagation import graph_for
 
-__all__ = ['material_factory']
+__all__ = ['material_factory', 'material_type_factory', 'warm_material_types']
+
+_material_types = {}
 
 
 def material_factory(*args, flow=False, **kwargs):
@@ -28,6 +30,19 @@ def material_factory(*args, flow=False, **kwargs):
 
 
 def material_type_factory(*args, flow=False):
+    r"""
+    Material type factory, identical combinations of sub-properties and flow return the same class
+
+    Args:
+        *args: Chainable sub-propperties
+        flow: is the material a continium flowing
+
+    Returns:
+        The material class
+    """
+    key = (args, flow)
+    if key in _material_types:
+        return _material_types[key]
     if flow:
         class FlowMaterial(Material, Thermal, Pressure, Flow, Shearing, Viscosity, *args):
             def __init__(self, **kwargs):
@@ -36,6 +51,7 @@ def material_type_factory(*args, flow=False):
         FlowMaterial.dtypes = args
         FlowMaterial.flow = flow
 
+        _material_types[key] = FlowMaterial
         return FlowMaterial
     else:
         class StaticMaterial(Material, Thermal, Pressure, Geometry, Mass, *args):
@@ -44,13 +60,48 @@ def material_type_factory(*args, flow=False):
 
         StaticMaterial.dtypes = args
         StaticMaterial.flow = flow
+
+        _material_types[key] = StaticMaterial
         return StaticMaterial
 
 
+def warm_material_types(*types):
+    r"""
+    Build material types up front and compile the propagation plans of all their linked attributes, such that the
+    first material of each type doesn't pay for it.
+
+    Args:
+        *types: tuples of (dtypes, flow), where dtypes is a tuple of Chainable sub-properties
+
+    Returns:
+        list of the material classes
+    """
+    classes = []
+    for dtypes, flow in types:
+        cls = material_type_factory(*dtypes, flow=flow)
+        instance = cls()
+        instance._propagation = graph_for(instance)
+        for _, attr in instance._depended_on:
+            instance._propagation.plan(instance, attr)
+        classes.append(cls)
+    return classes
+
+
+_link_graph = ('_depended_on', '_linked_attributes', '_linked_attributes_args', '_propagation', '_state',
+               '_logistic_properties')
+
+
 class _InitializedMaterial(object):
-    def __call__(self, *args):
+    def __call__(self, dtypes, flow, version=1):
+        cls = material_type_factory(*dtypes, flow=flow)
+        if version > cls._version:
+            raise ValueError('The material was written by version {} of the material class, this release reads version '
+                             '{} or earlier'.format(version, cls._version))
+        cls.freeze()
         obj = _InitializedMaterial()
-        obj.__class__ = material_type_factory(*args[0], flow=args[1])
+        obj.__class__ = cls
+        if version < cls._version:
+            obj.__dict__['_version'] = version
         return obj
 
 
@@ -60,13 +111,28 @@ class Material(Chainable):
         self._logistic_properties += ['name', 'short_name', 'CAS']
 
     def __reduce__(self):
-        return (_InitializedMaterial(), (self.dtypes, self.flow), self.__dict__)
+        return (_InitializedMaterial(), (self.dtypes, self.flow, self._version), self.__dict__)
+
+    def __setstate__(self, state):
+        if self.__dict__.pop('_version', self._version) < 2:
+            # Version 1 stored the link graph per instance, keyed on the instance itself. The class-level link graph
+            # replaces it, only the values are kept.
+            inputs = dict(self._frozen_inputs)
+            for key in state:
+                if key.startswith('_Guard_') and not key.endswith(('_unit', '_rng', '_doc')):
+                    inputs.setdefault(key[len('_Guard_'):], False)
+                elif key[0] != '_':
+                    inputs.setdefault(key, False)
+            state = {key: value for key, value in state.items()
+                     if key not in _link_graph and not key.startswith('_const_')}
+            state['_inputs'] = inputs
+        self.__dict__.update(state)
 
     dtypes = ()
 
     flow = False
 
-    _version = 1
+    _version = 2
     """int: version of the material class. Bump this value up for big changes in the class which aren't compatible with 
         earlier release. """
 
@@ -98,11 +164,40 @@ class Material(Chainable):
 
     @staticmethod
     def dump(instance, filename):
+        r"""
+        Write a material to a file in the compact format of :mod:`mechmat.serialization`
+
+        Args:
+            instance: The material, or an iterable of materials and states
+            filename (str): The file name
+        """
+        from mechmat import serialization
         with open(filename, 'wb') as f:
-            _dill.dump(instance, f)
+            serialization.dump(instance, f)
 
     @staticmethod
     def load(filename):
+        r"""
+        Read a material from a file written by :meth:`dump`, files pickled with dill by earlier releases are still read.
+        Materials of an earlier version of the material class use the link graph of the class, the link graph stored
+        with them is dropped.
+
+        Args:
+            filename (str): The file name
+
+        Returns:
+            The material, or a list of the materials when the file contains more than one
+
+        Raises:
+            ValueError: When the material was written by a newer version of the material class
+        """
+        with open(filename, 'rb') as f:
+            compact = f.read(2) == b'PK'
+        if compact:
+            from mechmat import serialization
+            materials = serialization.load(filename)
+            return materials[0] if len(materials) == 1 else materials
+        import dill
         with open(filename, 'rb') as f:
-            mat = _dill.load(f)
+            mat = dill.load(f)
         return mat
@@ -2,7 +2,7 @@ from mechmat import ureg
 from mechmat.properties.specific_volume import TwoDomainTaitpvT
 from mechmat.properties.viscosity import CrossWLF
 from mechmat.properties.thermal.polymer import ThermalPolymer
-from mechcite import cite
+from mechmat.core.bibliography import cite
 
 
 class Polycarbonate_CrossWLF(ThermalPolymer, CrossWLF):
@@ -1,73 +1,152 @@
-from scipy.interpolate import interp1d, interp2d
 from warnings import warn
-from functools import reduce
+from functools import reduce, partial
 import operator
+from numpy import ndim, where as _where, asarray, any, argsort, broadcast_arrays, interp, stack
 from mechmat import ureg
+from mechmat.core.units import unit_agnostic
 
-__all__ = ['reciprocal', 'sub', 'add', 'mul', 'div', 'Interp']
+__all__ = ['reciprocal', 'sub', 'add', 'mul', 'div', 'where', 'Interp']
 
 
+@unit_agnostic
 def reciprocal(value):
     return value ** -1
 
 
+@unit_agnostic
 def sub(**kwargs):
     return reduce(operator.__sub__, kwargs.values())
 
 
+@unit_agnostic
 def add(**kwargs):
     return reduce(operator.__add__, kwargs.values())
 
 
+@unit_agnostic
 def mul(**kwargs):
     return reduce(operator.__mul__, kwargs.values())
 
 
+@unit_agnostic
 def div(**kwargs):
     return reduce(operator.__truediv__, kwargs.values())
 
 
+def where(condition, x, y):
+    r"""
+    Unit aware element-wise selection between two values, used instead of an `if` statement in transforms which
+    should accept both scalars and arrays.
+
+    Args:
+        condition: Boolean or boolean array, where True yields x and False yields y
+        x: Value(s) selected where the condition is True
+        y: Value(s) selected where the condition is False
+
+    Returns:
+        x or y for a scalar condition, otherwise an array in the units of x
+    """
+    if ndim(condition) == 0:
+        return x if condition else y
+    if isinstance(x, ureg.Quantity):
+        if isinstance(y, ureg.Quantity):
+            y = y.to(x.u).m
+        return ureg.Quantity(_where(condition, x.m, y), x.u)
+    if isinstance(y, ureg.Quantity):
+        return ureg.Quantity(_where(condition, x, y.m), y.u)
+    return _where(condition, x, y)
+
+
 class Interp:
-    def __init__(self, kind='cubic', cite=None, **kwargs):
-        self._cite = cite
+    r"""
+    Interpolation of tabulated data as a transform. The keywords are the axes followed by the tabulated values, all
+    as Quantities. A single axis is interpolated with a 1-D spline, multiple axes span a regular grid of which the
+    values have one dimension per axis. For two axes the values are in the layout of `interp2d` by default, shaped
+    (len(y), len(x)), see `indexing`. When the axes and values are 1-D arrays of equal length, they are interpolated
+    as scattered points.
+
+    Interpolants are built once, so spline coefficients are computed only when the table is created. The
+    interpolation accepts scalars and arrays, arrays of arguments are broadcast against each other.
+
+    Args:
+        kind (str): The interpolation, 'linear', 'nearest', 'cubic' or 'pchip' (monotone piecewise cubic), or any
+         other kind supported by `scipy.interpolate.interp1d` for 1-D and `RegularGridInterpolator` for grids
+        cite: Citation decorator of the data, the data is cited when a material uses the table as transform
+        indexing (str): The layout of the values of a grid of two axes, 'xy' for values shaped (len(y), len(x)) as
+         for `interp2d`, 'ij' for values shaped (len(x), len(y)). Grids of more axes are always in the 'ij' layout
+        **kwargs: The axes and the tabulated values
+    """
+
+    def __init__(self, kind='cubic', cite=None, indexing='xy', **kwargs):
+        self._cite = (cite.key,) if cite is not None else ()
         self._kind = kind
         self._args = list(kwargs.keys())
         for key, value in kwargs.items():
             setattr(self, key, value)
-        if cite:
-            self._func = cite(self._build_interp(kind, **kwargs))
-        else:
-            self._func = self._build_interp(kind, **kwargs)
+        if indexing not in ('ij', 'xy'):
+            raise ValueError('Unknown indexing {}'.format(indexing))
+        self._indexing = indexing
+        try:
+            self._interp = self._build_interp(kind)
+        except ValueError:
+            self._interp = self._build_interp('linear')
+            self._kind = 'linear'
+            warn('{}-interpolation not possible. Linear-interpolation is used as fallback.'.format(kind))
 
     def __call__(self, **kwargs):
-        return self._func(*list(kwargs.values()))
+        axes = self._args[:-1]
+        if all(axis in kwargs for axis in axes):
+            return self._evaluate(*[kwargs[axis] for axis in axes])
+        return self._evaluate(*list(kwargs.values()))
+
+    def _evaluate(self, *args):
+        axes = self._args[:-1]
+        if len(args) != len(axes):
+            raise ValueError('Interp expects {} arguments'.format(len(axes)))
+        points = []
+        for axis, value in zip(axes, args):
+            table = getattr(self, axis)
+            if isinstance(value, ureg.Quantity):
+                value = value.m_as(table.u)
+            value = asarray(value, dtype=float)
+            if any(value < self._bounds[axis][0]) or any(value > self._bounds[axis][1]):
+                raise ValueError('A value for {} is outside the interpolation range'.format(axis))
+            points.append(value)
+        if len(points) == 1:
+            result = self._interp(points[0])
+        else:
+            points = broadcast_arrays(*points)
+            result = self._interp(stack(points, axis=-1).reshape(-1, len(points))).reshape(points[0].shape)
+        return ureg.Quantity(result if ndim(result) else float(result), getattr(self, self._args[-1]).u)
 
-    def _build_interp(self, kind, **kwargs):
+    def _build_interp(self, kind):
+        from scipy.interpolate import interp1d, CubicSpline, PchipInterpolator, RegularGridInterpolator, \
+            LinearNDInterpolator, NearestNDInterpolator, CloughTocher2DInterpolator
         args = self._args
-        if len(kwargs) == 2:
-            try:
-                self._interp = interp1d(getattr(self, args[0]).m, getattr(self, args[1]).m, kind=kind, copy=False)
-            except ValueError:
-                self._interp = interp1d(getattr(self, args[0]).m, getattr(self, args[1]).m, copy=False)
-                self._kind = 'linear'
-                warn('{}-interpolation not possible. Linear-interpolation is used as fallback.'.format(kind))
-
-            @ureg.wraps(getattr(self, args[1]).u, getattr(self, args[0]).u)
-            def func(x):
-                return self._interp(x).item()
-        elif len(kwargs) == 3:
-            try:
-                self._interp = interp2d(getattr(self, args[0]).m, getattr(self, args[1]).m, getattr(self, args[2]).m,
-                                        kind=kind, copy=False)
-            except ValueError:
-                self._interp = interp2d(getattr(self, args[0]).m, getattr(self, args[1]).m, getattr(self, args[2]).m,
-                                        copy=False)
-                self._kind = 'linear'
-                warn('{}-interpolation not possible. Linear-interpolation is used as fallback.'.format(kind))
-
-            @ureg.wraps(getattr(self, args[2]).u, (getattr(self, args[0]).u, getattr(self, args[1]).u))
-            def func(x, y):
-                return self._interp(x, y).item()
-        else:
-            raise ValueError('Interp should have either one axis or two axes')
-        return func
+        if len(args) < 2:
+            raise ValueError('Interp should have at least one axis')
+        axes = [asarray(getattr(self, arg).m, dtype=float) for arg in args[:-1]]
+        values = asarray(getattr(self, args[-1]).m, dtype=float)
+        self._bounds = {arg: (axis.min(), axis.max()) for arg, axis in zip(args[:-1], axes)}
+        if len(axes) == 1:
+            order = argsort(axes[0])
+            x, y = axes[0][order], values[order]
+            if kind == 'linear':
+                return partial(interp, xp=x, fp=y)
+            if kind == 'cubic':
+                return CubicSpline(x, y)
+            if kind == 'pchip':
+                return PchipInterpolator(x, y)
+            return interp1d(x, y, kind=kind, copy=False, assume_sorted=True)
+        if values.ndim == 1 and all(axis.shape == values.shape for axis in axes):
+            points = stack(axes, axis=-1)
+            if kind == 'nearest':
+                return NearestNDInterpolator(points, values)
+            if kind == 'cubic' and len(axes) == 2:
+                return CloughTocher2DInterpolator(points, values)
+            if kind != 'linear':
+                raise ValueError('{}-interpolation of scattered data is not supported'.format(kind))
+            return LinearNDInterpolator(points, values)
+        if len(axes) == 2 and self._indexing == 'xy':
+            values = values.T
+        return RegularGridInterpolator(axes, values, method=kind)
@@ -1,20 +1,63 @@
-from numpy import e
-from mechcite import cite
+from numpy import exp
+from mechmat.core.bibliography import cite
 from mechmat import ureg
+from mechmat.core.units import unit_agnostic, si_kernel, to_si
+
+_R = (1. * ureg.R).to_base_units().m
 
 
 @cite('osswald_polymer_2006')
 def arrhenius_shift(temperature, arrhenius_activation_energy, temperature_ref):
-    return e ** (arrhenius_activation_energy / ureg.R * (1. / temperature - 1. / temperature_ref)).to('dimensionless').m
+    return _arrhenius_shift(to_si(temperature, ureg.K), to_si(arrhenius_activation_energy, ureg.J / ureg.mol),
+                            to_si(temperature_ref, ureg.K))
+
+
+@si_kernel(arrhenius_shift)
+@cite('osswald_polymer_2006')
+def _arrhenius_shift(temperature, arrhenius_activation_energy, temperature_ref):
+    return exp(arrhenius_activation_energy / _R * (1. / temperature - 1. / temperature_ref))
 
+
+@unit_agnostic
 @cite('cross_rheology_1965')
 def zero_shear_viscosity(arrhenius, zero_shear_viscosity_ref):
     return arrhenius * zero_shear_viscosity_ref
 
+
+@unit_agnostic
 @cite('cross_rheology_1965')
 def relaxation_time(relaxation_time_ref, arrhenius):
     return arrhenius * relaxation_time_ref
 
+
+@unit_agnostic
 @cite('cross_rheology_1965')
 def viscosity_dynamic(shear_rate, zero_shear_viscosity, relaxation_time, shear_thinning_const):
     return zero_shear_viscosity / (1. + relaxation_time * shear_rate) ** shear_thinning_const
+
+
+@cite('osswald_polymer_2006')
+@cite('cross_rheology_1965')
+def cross_arrhenius(temperature, shear_rate, arrhenius_activation_energy, temperature_ref, relaxation_time_ref,
+                    zero_shear_viscosity_ref, shear_thinning_const):
+    r"""
+    Fused evaluation of the Cross-Arrhenius model in a single broadcasted pass. All arguments are magnitudes in SI
+    base units. Stacking the parameters of M materials with shape (M, 1) against N states with shape (N,) evaluates
+    all M x N combinations at once.
+
+    Args:
+        temperature: The temperature :math:`T`
+        shear_rate: The shear rate :math:`\dot{\gamma}`
+        arrhenius_activation_energy: The Arrhenius activation energy :math:`E_a`
+        temperature_ref: The reference temperature :math:`T_{ref}`
+        relaxation_time_ref: The relaxation time at the reference temperature :math:`\lambda(T_{ref})`
+        zero_shear_viscosity_ref: The zero shear viscosity at the reference temperature :math:`\eta_0(T_{ref})`
+        shear_thinning_const: The shear thinning constant :math:`a`
+
+    Returns:
+        tuple of the Arrhenius shift, zero shear viscosity, relaxation time and dynamic viscosity
+    """
+    arrhenius = _arrhenius_shift(temperature, arrhenius_activation_energy, temperature_ref)
+    eta_0 = arrhenius * zero_shear_viscosity_ref
+    relaxation = arrhenius * relaxation_time_ref
+    return arrhenius, eta_0, relaxation, eta_0 / (1. + relaxation * shear_rate) ** shear_thinning_const
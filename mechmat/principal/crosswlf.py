@@ -1,8 +1,10 @@
 from mechmat import ureg
-from mechcite import cite
-from numpy import e
+from mechmat.core.units import unit_agnostic, si_kernel
+from mechmat.core.bibliography import cite
+from numpy import exp
 
 
+@unit_agnostic
 @cite('osswald_polymer_2015')
 def viscosity_dynamic(shear_rate, tau_star, zero_shear_viscosity, n):
     r"""
@@ -44,6 +46,12 @@ def critical_shear_stress(n):
     return tau_star ** (n / (1. - n)) * ureg.Pa
 
 
+@si_kernel(critical_shear_stress)
+@cite('osswald_polymer_2015')
+def _critical_shear_stress(n):
+    return (4. * n / (3. * n + 1)) ** (n / (1. - n))
+
+
 @cite('osswald_polymer_2015')
 def zero_shear_viscosity(temperature, D_1, temperature_glass_transition, A_1, A_2):
     r"""
@@ -65,9 +73,57 @@ def zero_shear_viscosity(temperature, D_1, temperature_glass_transition, A_1, A_
     """
     shift = A_1 * (temperature.to('K') - temperature_glass_transition)
     shift /= A_2 + temperature.to('K') - temperature_glass_transition
-    return D_1 * e ** (- shift)
+    return D_1 * exp(- shift)
+
+
+@si_kernel(zero_shear_viscosity)
+@cite('osswald_polymer_2015')
+def _zero_shear_viscosity(temperature, D_1, temperature_glass_transition, A_1, A_2):
+    shift = A_1 * (temperature - temperature_glass_transition)
+    shift /= A_2 + temperature - temperature_glass_transition
+    return D_1 * exp(- shift)
 
 
+@unit_agnostic
 @cite('osswald_polymer_2015')
 def glass_transition_temperature(D_2, D_3, p):
     return D_2 + D_3 * p
+
+
+@cite('osswald_polymer_2015')
+def cross_wlf(temperature, p, shear_rate, D_1, D_2, D_3, A_1, A_2, n, tau_star):
+    r"""
+    Fused evaluation of the Cross-WLF model with its analytic derivatives with respect to the temperature and shear
+    rate, in a single vectorized pass. With :math:`x = T - D_2 - D_3 p` and
+    :math:`u = \left(\frac{\eta_0 \dot{\gamma}}{\tau^{*}}\right)^{1-n}`:
+
+    .. math::
+
+       \frac{\partial \eta}{\partial T} = \frac{1 + n u}{(1 + u)^2} \frac{\partial \eta_0}{\partial T}
+       = - \frac{1 + n u}{(1 + u)^2} \frac{A_1 A_2}{(A_2 + x)^2} \eta_0
+
+       \frac{\partial \eta}{\partial \dot{\gamma}} = - \frac{(1 - n) u}{(1 + u) \dot{\gamma}} \eta
+
+    All arguments are magnitudes in SI base units, temperature, p and shear_rate may be arrays of any shape which
+    broadcast against each other. The shear rate derivative requires a positive shear rate.
+
+    Args:
+        temperature: The temperature :math:`T`
+        p: The pressure :math:`p`
+        shear_rate: The shear rate :math:`\dot{\gamma}`
+        D_1, D_2, D_3, A_1, A_2: The WLF coefficients
+        n: The power law index :math:`n`
+        tau_star: The critical shear stress :math:`\tau^{*}`
+
+    Returns:
+        tuple of the viscosity :math:`\eta` and the derivatives :math:`\frac{\partial \eta}{\partial T}` and
+        :math:`\frac{\partial \eta}{\partial \dot{\gamma}}`
+    """
+    x = temperature - D_2 - D_3 * p
+    A_2_x = A_2 + x
+    eta_0 = D_1 * exp(- A_1 * x / A_2_x)
+    u = (eta_0 * shear_rate / tau_star) ** (1. - n)
+    eta = eta_0 / (1. + u)
+    d_eta_d_T = - (1. + n * u) / (1. + u) ** 2 * A_1 * A_2 / A_2_x ** 2 * eta_0
+    d_eta_d_shear_rate = - (1. - n) * u / ((1. + u) * shear_rate) * eta
+    return eta, d_eta_d_T, d_eta_d_shear_rate
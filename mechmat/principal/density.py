@@ -1,7 +1,10 @@
 from .. import ureg
+from mechmat.core.units import si_kernel
 
 __all__ = ['from_specific_weight']
 
+_g_n = (1. * ureg.g_n).to_base_units().m
+
 
 def from_specific_weight(specific_weight):
     r"""
@@ -13,3 +16,8 @@ def from_specific_weight(specific_weight):
 
     """
     return specific_weight / ureg.g_n
+
+
+@si_kernel(from_specific_weight)
+def _from_specific_weight(specific_weight):
+    return specific_weight / _g_n
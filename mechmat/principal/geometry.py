@@ -1,5 +1,6 @@
 from numpy.linalg import norm
 from mechmat import ureg
+from mechmat.core.units import unit_agnostic, si_kernel
 
 __all__ = ['distance', 'halfway']
 
@@ -21,5 +22,11 @@ def distance(point_1, point_2):
     return norm(point_2 - point_1)
 
 
+@si_kernel(distance)
+def _distance(point_1, point_2):
+    return norm(point_2 - point_1)
+
+
+@unit_agnostic
 def halfway(point_1, point_2):
     return point_1 + (point_2 - point_1) / 2
@@ -1,9 +1,12 @@
-from mechcite import cite
+from mechmat.core.bibliography import cite
 from math import pi
 
+from mechmat.core.units import unit_agnostic
+
 __all__ = ['circle', 'annulus']
 
 
+@unit_agnostic
 @cite('rao_basic_2017')
 def circle(V_dot, r):
     r""""
@@ -25,6 +28,7 @@ def circle(V_dot, r):
     return 4. * V_dot / (pi * r ** 3)
 
 
+@unit_agnostic
 @cite('rao_basic_2017')
 def annulus(V_dot, r_i, r_o):
     r"""
@@ -1,7 +1,10 @@
 from .. import ureg
+from mechmat.core.units import si_kernel
 
 __all__ = ['from_density']
 
+_g_n = (1. * ureg.g_n).to_base_units().m
+
 
 def from_density(density):
     r"""
@@ -13,3 +16,8 @@ def from_density(density):
 
     """
     return density * ureg.g_n
+
+
+@si_kernel(from_density)
+def _from_density(density):
+    return density * _g_n
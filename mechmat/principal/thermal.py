@@ -1,3 +1,7 @@
+from mechmat.core.units import unit_agnostic
+
+
+@unit_agnostic
 def thermal_diffusivity(thermal_conductivity, specific_heat_capacity, density):
     r"""
     The rate of transfer of heat of a material from the hot end to the cold end.
@@ -17,9 +21,11 @@ def thermal_diffusivity(thermal_conductivity, specific_heat_capacity, density):
     return thermal_conductivity / (density * specific_heat_capacity)
 
 
+@unit_agnostic
 def thermal_conductivity(thermal_diffusivity, specific_heat_capacity, density):
     return thermal_diffusivity * density * specific_heat_capacity
 
 
+@unit_agnostic
 def specific_heat_capacity(thermal_conductivity, density, thermal_diffusivity):
     thermal_conductivity / (density * thermal_diffusivity)
@@ -1,4 +1,4 @@
-from mechcite import cite
+from mechmat.core.bibliography import cite
 
 
 @cite('osswald_materials_2012')
@@ -1,43 +1,74 @@
-from mechcite import cite
-from numpy import log, e
+from mechmat.core.bibliography import cite
+from numpy import asarray, log, log1p, exp, where as _where
 
-from mechmat import ureg
+from mechmat.core.units import unit_agnostic
+from mechmat.principal.core import where
 
-__all__ = ['get_specific_volume', 'get_B', 'switch_m_s', 'get_T_t', 'get_v_0', 'get_v_t']
+__all__ = ['get_specific_volume', 'get_B', 'switch_m_s', 'get_T_t', 'get_v_0', 'get_v_t', 'tait_pvt']
 
+_C = 0.0894
 
+
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def get_specific_volume(p, v_0, v_t, B):
-    C = 0.0894
-    return v_0 * (1. - C * log(1. + p / B)) + v_t
+    return v_0 * (1. - _C * log(1. + p / B)) + v_t
 
 
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def get_v_0(T, b_1, b_2, b_5):
     return b_1 + b_2 * (T - b_5)
 
 
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def get_v_t(p, T, T_t, b_5, b_7, b_8, b_9):
-    if T > T_t:
-        return 0. * ureg.m ** 3 / ureg.kg
-    else:
-        return b_7 * e ** (b_8 * (T - b_5) - b_9 * p)
+    v_t = b_7 * exp(b_8 * (T - b_5) - b_9 * p)
+    return where(T > T_t, 0. * v_t, v_t)
 
 
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def get_B(T, b_3, b_4, b_5):
-    return b_3 * e ** (-b_4 * (T - b_5))
+    return b_3 * exp(-b_4 * (T - b_5))
 
 
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def get_T_t(p, b_5, b_6):
     return b_5 + b_6 * p
 
 
+@unit_agnostic
 @cite('osswald_polymer_2006')
 def switch_m_s(T, T_t, s, m):
-    if T > T_t:
-        return m
-    else:
-        return s
+    return where(T > T_t, m, s)
+
+
+@cite('osswald_polymer_2006')
+def tait_pvt(T, p, b_1s, b_1m, b_2s, b_2m, b_3s, b_3m, b_4s, b_4m, b_5, b_6, b_7, b_8, b_9):
+    r"""
+    Fused evaluation of the two-domain Tait model, which determines the transition temperature, the domain and the
+    specific volume in a single vectorized pass. All arguments are magnitudes in SI base units, T and p may be
+    arrays of any shape which broadcast against each other.
+
+    Args:
+        T: Temperature
+        p: Pressure
+        b_1s, b_1m, b_2s, b_2m, b_3s, b_3m, b_4s, b_4m: Coefficients of the solid and melt domain
+        b_5, b_6, b_7, b_8, b_9: Coefficients of the transition
+
+    Returns:
+        tuple of the specific volume, the transition temperature and the mask of the melt domain
+    """
+    T_t = b_5 + b_6 * p
+    melt = T > T_t
+    dT = T - b_5
+    B = _where(melt, b_3m, b_3s) * exp(-_where(melt, b_4m, b_4s) * dT)
+    v = _where(melt, b_2m, b_2s) * dT
+    v += _where(melt, b_1m, b_1s)
+    v *= 1. - _C * log1p(p / B)
+    if (asarray(b_7) != 0.).any():
+        v += _where(melt, 0., b_7 * exp(b_8 * dT - b_9 * p))
+    return v, T_t, melt
@@ -1,6 +1,7 @@
-from mechcite import cite
+from mechmat.core.bibliography import cite
 from mechmat import ureg
 from mechmat.core.chainable import Chainable, Guarded
+from mechmat.core.units import to_si, from_si
 from mechmat.principal import twodomaintaitpvt
 
 class TwoDomainTaitpvT(Chainable):
@@ -92,6 +93,28 @@ class TwoDomainTaitpvT(Chainable):
         self.link_attr('temperature_transition', twodomaintaitpvt.get_T_t, p='pressure', b_5='b_5', b_6='b_6')
 
 
+    def specific_volume_grid(self, T, p, full_output=False):
+        r"""
+        The specific volume for arrays of temperatures and pressures, evaluated in a single vectorized pass with the
+        coefficients of this material instead of through the linked attributes. Suited for pvT diagrams and fields
+        with many points.
+
+        Args:
+            T: Temperature(s), Quantity scalar or array
+            p: Pressure(s), Quantity scalar or array broadcasting against T. Use T[:, None] for a T x p diagram.
+            full_output (bool): Also return the transition temperature and the mask of the melt domain
+
+        Returns:
+            The specific volume, or a tuple of the specific volume, transition temperature and melt mask
+        """
+        coefficients = {name: self._magnitude(name) for name in ['b_1s', 'b_1m', 'b_2s', 'b_2m', 'b_3s', 'b_3m',
+                                                                 'b_4s', 'b_4m', 'b_5', 'b_6', 'b_7', 'b_8', 'b_9']}
+        v, T_t, melt = twodomaintaitpvt.tait_pvt(to_si(T, ureg.K), to_si(p, ureg.Pa), **coefficients)
+        v = from_si(v, ureg.m ** 3 / ureg.kg)
+        if full_output:
+            return v, from_si(T_t, ureg.degC), melt
+        return v
+
     _B = Guarded()
 
     b_1s = Guarded()
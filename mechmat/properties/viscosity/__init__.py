@@ -1,3 +1,3 @@
 from mechmat.properties.viscosity.viscosity import Viscosity
-from mechmat.properties.viscosity.crossarrhenius import CrossArrhenius
+from mechmat.properties.viscosity.crossarrhenius import CrossArrhenius, CrossArrheniusBatch
 from mechmat.properties.viscosity.crosswlf import CrossWLF
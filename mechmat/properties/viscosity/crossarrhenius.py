@@ -1,7 +1,13 @@
+from numpy import stack, ndim, expand_dims, atleast_1d, broadcast_arrays
+
 from mechmat import ureg
 from mechmat.core.chainable import Chainable, Guarded
+from mechmat.core.units import to_si, from_si
 from mechmat.principal import crossarrhenius
-from mechcite import cite
+from mechmat.core.bibliography import cite
+
+__all__ = ['CrossArrhenius', 'CrossArrheniusBatch']
+
 
 class CrossArrhenius(Chainable):
     r"""
@@ -43,7 +49,7 @@ class CrossArrhenius(Chainable):
 
         self.set_guard('relaxation_time', ureg.s)
         self.link_attr('relaxation_time', crossarrhenius.relaxation_time, relaxation_time_ref='relaxation_time_ref',
-                       zero_shear_viscosity_ref='viscosity_zero_shear_rate_ref')
+                       arrhenius='_arrhenius')
 
         self.set_guard('relaxation_time_ref', ureg.s)
         self.link_attr('viscosity_dynamic', crossarrhenius.viscosity_dynamic, shear_rate='shear_rate',
@@ -75,3 +81,74 @@ class CrossArrhenius(Chainable):
     shear_thinning_const = Guarded()
 
     temperature_cross_arrhenius_ref = Guarded()
+
+
+class CrossArrheniusBatch:
+    r"""
+    Cross-Arrhenius model of M parameter sets, such as resin grades, evaluated at N states in a single broadcasted
+    pass. The parameters are stacked as arrays of length M, the results have the shape (M,) + the shape of the
+    states. Scalar parameters are broadcast against the others, a batch of scalar parameters holds a single set.
+
+    Args:
+        arrhenius_activation_energy: Quantity array of the Arrhenius activation energies
+        temperature_cross_arrhenius_ref: Quantity array of the reference temperatures
+        relaxation_time_ref: Quantity array of the relaxation times at the reference temperatures
+        viscosity_zero_shear_rate_ref: Quantity array of the zero shear viscosities at the reference temperatures
+        shear_thinning_const: Array of the shear thinning constants
+    """
+
+    _parameters = {'arrhenius_activation_energy': ureg.J / ureg.mol,
+                   'temperature_cross_arrhenius_ref': ureg.K,
+                   'relaxation_time_ref': ureg.s,
+                   'viscosity_zero_shear_rate_ref': ureg.Pa * ureg.s,
+                   'shear_thinning_const': ureg.dimensionless}
+
+    def __init__(self, arrhenius_activation_energy, temperature_cross_arrhenius_ref, relaxation_time_ref,
+                 viscosity_zero_shear_rate_ref, shear_thinning_const):
+        values = [arrhenius_activation_energy, temperature_cross_arrhenius_ref, relaxation_time_ref,
+                  viscosity_zero_shear_rate_ref, shear_thinning_const]
+        magnitudes = [atleast_1d(to_si(value, unit)) for value, unit in zip(values, self._parameters.values())]
+        self._si = dict(zip(self._parameters, broadcast_arrays(*magnitudes)))
+
+    @classmethod
+    def from_materials(cls, materials):
+        r"""
+        Stack the parameters of materials with the :class:`CrossArrhenius` property
+
+        Args:
+            materials: Sequence of M materials
+
+        Returns:
+            :class:`CrossArrheniusBatch`
+        """
+        batch = cls.__new__(cls)
+        batch._si = {name: stack([material._magnitude(name) for material in materials]) for name in cls._parameters}
+        return batch
+
+    def __len__(self):
+        return len(self._si['shear_thinning_const'])
+
+    def __call__(self, temperature, shear_rate):
+        r"""
+        Evaluate all parameter sets at all states
+
+        Args:
+            temperature: Quantity scalar or array of the temperatures of the states
+            shear_rate: Quantity scalar or array of the shear rates of the states, broadcasting against temperature
+
+        Returns:
+            dict: Quantity arrays of the arrhenius shift, viscosity_zero_shear_rate, relaxation_time and
+            viscosity_dynamic
+        """
+        temperature = to_si(temperature, ureg.K)
+        shear_rate = to_si(shear_rate, ureg.s ** -1)
+        axes = tuple(range(1, 1 + max(ndim(temperature), ndim(shear_rate))))
+        parameters = {name: expand_dims(value, axes) if axes else value for name, value in self._si.items()}
+        arrhenius, eta_0, relaxation, eta = crossarrhenius.cross_arrhenius(
+            temperature, shear_rate, parameters['arrhenius_activation_energy'],
+            parameters['temperature_cross_arrhenius_ref'], parameters['relaxation_time_ref'],
+            parameters['viscosity_zero_shear_rate_ref'], parameters['shear_thinning_const'])
+        return {'arrhenius': from_si(arrhenius, ureg.dimensionless),
+                'viscosity_zero_shear_rate': from_si(eta_0, ureg.Pa * ureg.s),
+                'relaxation_time': from_si(relaxation, ureg.s),
+                'viscosity_dynamic': from_si(eta, ureg.Pa * ureg.s)}
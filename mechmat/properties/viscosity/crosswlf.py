@@ -1,7 +1,8 @@
 from mechmat import ureg
 from mechmat.core.chainable import Chainable, Guarded
+from mechmat.core.units import to_si, from_si
 from mechmat.principal import crosswlf
-from mechcite import cite
+from mechmat.core.bibliography import cite
 from math import inf
 
 
@@ -34,12 +35,38 @@ class CrossWLF(Chainable):
         self.link_attr('tau_star', crosswlf.critical_shear_stress, n='n')
 
         self.link_attr('temperature_glass', crosswlf.glass_transition_temperature, D_2='D_2', D_3='D_3', p='pressure')
+        self.set_guard('viscosity_zero_shear_rate', ureg.Pa * ureg.s)
 
         self.link_attr('viscosity_zero_shear_rate', crosswlf.zero_shear_viscosity, temperature='temperature', D_1='D_1',
                        temperature_glass_transition='temperature_glass', A_1='A_1', A_2='A_2')
 
         self.link_attr('viscosity_dynamic', crosswlf.viscosity_dynamic, shear_rate='shear_rate', tau_star='tau_star', zero_shear_viscosity='viscosity_zero_shear_rate', n='n')
 
+    def viscosity_dynamic_grid(self, T, p, shear_rate, derivatives=False):
+        r"""
+        The dynamic viscosity for arrays of temperatures, pressures and shear rates, evaluated in a single vectorized
+        pass with the coefficients of this material instead of through the linked attributes.
+
+        Args:
+            T: Temperature(s), Quantity scalar or array
+            p: Pressure(s), Quantity scalar or array
+            shear_rate: Shear rate(s), Quantity scalar or array
+            derivatives (bool): Also return the derivatives with respect to the temperature and shear rate, see
+             :func:`~mechmat.principal.crosswlf.cross_wlf`
+
+        Returns:
+            The dynamic viscosity, or a tuple of the viscosity and its derivatives with respect to the temperature
+            and shear rate
+        """
+        coefficients = {name: self._magnitude(name) for name in ['D_1', 'D_2', 'D_3', 'A_1', 'A_2', 'n', 'tau_star']}
+        eta, d_eta_d_T, d_eta_d_shear_rate = crosswlf.cross_wlf(to_si(T, ureg.K), to_si(p, ureg.Pa),
+                                                                to_si(shear_rate, ureg.s ** -1), **coefficients)
+        eta = from_si(eta, ureg.Pa * ureg.s)
+        if derivatives:
+            return eta, from_si(d_eta_d_T, ureg.Pa * ureg.s / ureg.K), from_si(d_eta_d_shear_rate,
+                                                                               ureg.Pa * ureg.s ** 2)
+        return eta
+
     A_1 = Guarded()
 
     A_2 = Guarded()
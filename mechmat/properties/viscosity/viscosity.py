@@ -1,7 +1,7 @@
 from mechmat import ureg
 from mechmat.core.chainable import Chainable, Guarded
 from mechmat.principal import core
-from mechcite import cite
+from mechmat.core.bibliography import cite
 from math import inf
 
 
@@ -0,0 +1,188 @@
+r"""
+Compact serialization of materials and their states.
+
+Only what is needed to rebuild a material is stored: the identity of its class, i.e. the Chainable sub-properties and
+whether it flows, and the inputs set by the user which differ from a fresh instance of that class. Everything else,
+such as the linked attributes and the values computed from the inputs, is rebuilt by the normal propagation when the
+material is loaded. Any number of materials and states, of any number of material classes, are stored in one file.
+
+The file is a numpy ``.npz`` archive without pickled objects. It contains a JSON header describing the material
+classes (schemas) and the records, and per schema a matrix with a row per record and a column per scalar input.
+Quantities are stored as magnitudes in SI base units. Array-valued inputs, such as a state over a range of
+temperatures, are stored as separate arrays. Strings and other plain values, such as the name, are kept in the header.
+"""
+
+import json
+import warnings
+from importlib import import_module
+
+from numpy import asarray, float64, frombuffer, full, nan, ndarray, uint8, zeros, load as _load, savez, \
+    savez_compressed
+
+from mechmat import ureg
+from mechmat.core.chainable import Chainable, _equal
+from mechmat.core.units import si_conversion, to_si
+from mechmat.material import material_type_factory
+
+__all__ = ['dump', 'load', 'inputs', 'FORMAT', 'VERSION']
+
+FORMAT = 'mechmat'
+r"""str: Name of the format, stored in the header"""
+
+VERSION = 1
+r"""int: Version of the format, stored in the header"""
+
+_prototypes = {}
+
+
+def _path(cls):
+    return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
+
+def _resolve(path):
+    module, qualname = path.split(':')
+    obj = import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _prototype(cls):
+    if cls not in _prototypes:
+        _prototypes[cls] = cls()
+    return _prototypes[cls]
+
+
+def inputs(material):
+    r"""
+    The inputs of a material which differ from a fresh instance of its class, in the order they were first set.
+    Linked attributes which the class itself assigns on construction are computed values, they are left out unless
+    they were set on the material or one of the states it is derived from.
+
+    Args:
+        material (Chainable): The material
+
+    Returns:
+        dict of the attributes and their current values
+    """
+    prototype = _prototype(type(material))
+    values = {}
+    for key, assigned in (material._inputs or {}).items():
+        if isinstance(getattr(Chainable, key, None), property) or (
+                not assigned and key in prototype._linked_attributes):
+            continue
+        value = getattr(material, key)
+        if not _equal(getattr(prototype, key), value):
+            values[key] = value
+    return values
+
+
+def dump(materials, filename, compress=True):
+    r"""
+    Write materials to a file
+
+    Args:
+        materials: A material or an iterable of materials and states
+        filename (str): The file name, numpy appends ``.npz`` when it has no extension
+        compress (bool): Compress the arrays
+
+    Raises:
+        TypeError: When an input can't be stored
+    """
+    if isinstance(materials, Chainable):
+        materials = [materials]
+    schemas = []
+    schema_index = {}
+    columns = []
+    rows = []
+    records = []
+    arrays = {}
+    for material in materials:
+        cls = type(material)
+        if cls not in schema_index:
+            schema_index[cls] = len(schemas)
+            schemas.append({'dtypes': [_path(dtype) for dtype in cls.dtypes], 'flow': cls.flow,
+                            'version': cls._version, 'columns': []})
+            columns.append({})
+            rows.append([])
+        index = schema_index[cls]
+        row = {}
+        record = {'schema': index, 'row': len(rows[index]), 'meta': {}, 'arrays': {}}
+        for key, value in inputs(material).items():
+            unit = None
+            if isinstance(value, ureg.Quantity):
+                unit = str(si_conversion(value.u)[0])
+                value = to_si(value, value.u)
+            if isinstance(value, ndarray) and value.ndim:
+                name = 'a{}_{}'.format(len(records), key)
+                arrays[name] = asarray(value, dtype=float64)
+                record['arrays'][key] = [name, unit]
+            elif isinstance(value, float) or unit is not None:
+                column = columns[index].setdefault((key, unit), len(columns[index]))
+                row[column] = float(value)
+            elif value is None or isinstance(value, (str, bool, int)):
+                record['meta'][key] = value
+            else:
+                raise TypeError('Input {} of type {} can\'t be serialized'.format(key, type(value).__name__))
+        rows[index].append(row)
+        records.append(record)
+    for index, (schema, schema_columns, schema_rows) in enumerate(zip(schemas, columns, rows)):
+        schema['columns'] = [list(column) for column in schema_columns]
+        matrix = full((len(schema_rows), len(schema_columns)), nan)
+        mask = zeros(matrix.shape, dtype=bool)
+        for i, row in enumerate(schema_rows):
+            for column, value in row.items():
+                matrix[i, column] = value
+                mask[i, column] = True
+        schema['matrix'] = 's{}'.format(index)
+        schema['mask'] = 'm{}'.format(index)
+        arrays[schema['matrix']] = matrix
+        arrays[schema['mask']] = mask
+    header = {'format': FORMAT, 'version': VERSION, 'schemas': schemas, 'records': records}
+    arrays['header'] = frombuffer(json.dumps(header).encode('utf-8'), dtype=uint8)
+    (savez_compressed if compress else savez)(filename, **arrays)
+
+
+def load(filename, lazy=True):
+    r"""
+    Read materials from a file written by :func:`dump`
+
+    Args:
+        filename (str): The file name
+        lazy (bool): Load the materials with lazy evaluation, the values computed from the inputs are only computed
+         when read (see :attr:`~mechmat.core.chainable.Chainable.lazy`). Loading many states eagerly propagates all
+         their inputs up front and is about ten times slower
+
+    Returns:
+        list of the materials, in the order they were written
+
+    Raises:
+        ValueError: When the file isn't in this format, or in a newer version of it
+    """
+    with _load(filename, allow_pickle=False) as data:
+        header = json.loads(data['header'].tobytes().decode('utf-8'))
+        if header.get('format') != FORMAT or header.get('version', VERSION + 1) > VERSION:
+            raise ValueError('{} is not a {} file of version {} or earlier'.format(filename, FORMAT, VERSION))
+        schemas = []
+        for schema in header['schemas']:
+            cls = material_type_factory(*[_resolve(dtype) for dtype in schema['dtypes']], flow=schema['flow'])
+            if schema['version'] != cls._version:
+                warnings.warn('Materials in {} were written by version {} of the material class, this is version {}'
+                              .format(filename, schema['version'], cls._version))
+            prototype = cls()
+            prototype.lazy = lazy
+            columns = [(key, None if unit is None else ureg.Unit(unit)) for key, unit in schema['columns']]
+            schemas.append((prototype, columns, data[schema['matrix']], data[schema['mask']]))
+        materials = []
+        for record in header['records']:
+            prototype, columns, matrix, mask = schemas[record['schema']]
+            row = record['row']
+            values = {}
+            for (key, unit), value, present in zip(columns, matrix[row].tolist(), mask[row].tolist()):
+                if present:
+                    values[key] = value if unit is None else ureg.Quantity(value, unit)
+            for key, (name, unit) in record['arrays'].items():
+                values[key] = data[name] if unit is None else ureg.Quantity(data[name], unit)
+            values.update(record['meta'])
+            materials.append(prototype(**values))
+    return materials
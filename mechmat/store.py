@@ -0,0 +1,161 @@
+r"""
+Columnar storage of many material states.
+
+A sweep results in many states of a material, of which usually only a few properties are needed later on. A
+:class:`StateStore` keeps the state attributes of all those states column-wise on disk, in a directory with a
+``header.json`` describing the columns and their units, and a NumPy ``.npy`` file per column. The columns are
+memory-mapped, so a single column is read without copying it into memory and without deserializing any objects::
+
+    store = StateStore.create('sweep', states)
+    viscosity = StateStore('sweep')['viscosity_dynamic']
+
+The magnitudes are stored in the unit of the property in the first state. Attributes which aren't set in a state are
+stored as NaN.
+"""
+
+import json
+import os
+
+from numpy import float64, load, nan, shape
+from numpy.lib.format import open_memmap
+
+from mechmat import ureg
+
+__all__ = ['StateStore']
+
+FORMAT = 'mechmat-states'
+VERSION = 1
+
+
+def _shape(value):
+    return shape(value.m if isinstance(value, ureg.Quantity) else value)
+
+
+class StateStore:
+    r"""
+    Memory-mapped columns of the state attributes of many material states
+
+    Args:
+        path (str): The directory of the store, as written by :meth:`create`
+        mode (str): Memory-map mode of the columns, 'r' for read-only or 'r+' to modify them in place
+
+    Raises:
+        ValueError: When the directory isn't a state store
+    """
+
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, 'header.json')) as f:
+            header = json.load(f)
+        if header.get('format') != FORMAT or header.get('version', VERSION + 1) > VERSION:
+            raise ValueError('{} is not a state store of version {} or earlier'.format(path, VERSION))
+        self._length = header['length']
+        self.units = {name: column['unit'] for name, column in header['columns'].items()}
+        self._columns = {}
+
+    @classmethod
+    def create(cls, path, states, attributes=None, length=None, dtype=float64):
+        r"""
+        Write the state attributes of material states to a new store
+
+        Args:
+            path (str): The directory of the store, it is created when it doesn't exist
+            states: Iterable of material states of the same material type
+            attributes (list): The attributes to store, defaults to all state attributes which are set in the first
+             state
+            length (int): The number of states, required when states is an iterator
+            dtype: Data type of the columns
+
+        Returns:
+            The :class:`StateStore`, opened read-only
+
+        Raises:
+            ValueError: When the states have different shapes, or there are fewer states than length
+        """
+        if length is None:
+            length = len(states)
+        os.makedirs(path, exist_ok=True)
+        columns = None
+        count = 0
+        for index, state in enumerate(states):
+            if columns is None:
+                columns = cls._columns_of(path, state, attributes, length, dtype)
+            for name, (column, unit) in columns.items():
+                value = getattr(state, name)
+                if value is None:
+                    column[index] = nan
+                    continue
+                if _shape(value) != column.shape[1:]:
+                    raise ValueError('State {} has shape {} for {}, expected {}'.format(
+                        index, _shape(value), name, column.shape[1:]))
+                column[index] = value.m_as(unit) if isinstance(value, ureg.Quantity) else value
+            count = index + 1
+        if count != length:
+            raise ValueError('Expected {} states, got {}'.format(length, count))
+        header = {'format': FORMAT, 'version': VERSION, 'length': length, 'columns': {}}
+        for name, (column, unit) in (columns or {}).items():
+            header['columns'][name] = {'unit': None if unit is None else str(unit), 'shape': list(column.shape[1:]),
+                                       'dtype': column.dtype.str}
+            column.flush()
+        with open(os.path.join(path, 'header.json'), 'w') as f:
+            json.dump(header, f, indent=1)
+        return cls(path)
+
+    @staticmethod
+    def _columns_of(path, state, attributes, length, dtype):
+        if attributes is None:
+            attributes = [name for name in state._state if isinstance(getattr(state, name), (ureg.Quantity, float))]
+        columns = {}
+        for name in attributes:
+            value = getattr(state, name)
+            unit = value.u if isinstance(value, ureg.Quantity) else None
+            column = open_memmap(os.path.join(path, '{}.npy'.format(name)), mode='w+', dtype=dtype,
+                                 shape=(length,) + _shape(value))
+            columns[name] = (column, unit)
+        return columns
+
+    @property
+    def columns(self):
+        r"""
+        list: The names of the stored attributes """
+        return list(self.units)
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, name):
+        return name in self.units
+
+    def magnitude(self, name):
+        r"""
+        The magnitudes of an attribute of all states, memory-mapped from disk
+
+        Args:
+            name (str): The attribute
+
+        Returns:
+            `numpy.memmap` with the states along the first axis
+        """
+        if name not in self._columns:
+            if name not in self.units:
+                raise KeyError(name)
+            self._columns[name] = load(os.path.join(self.path, '{}.npy'.format(name)), mmap_mode=self.mode)
+        return self._columns[name]
+
+    def __getitem__(self, name):
+        r"""
+        An attribute of all states as Quantity, of which the magnitude is memory-mapped from disk
+
+        Args:
+            name (str): The attribute
+
+        Returns:
+            Quantity, or the magnitudes for attributes without a unit
+        """
+        magnitude = self.magnitude(name)
+        unit = self.units[name]
+        return magnitude if unit is None else ureg.Quantity(magnitude, unit)
+
+    def __repr__(self):
+        return '<StateStore of {} states with {} columns at {}>'.format(len(self), len(self.units), self.path)
@@ -0,0 +1,118 @@
+r"""
+Streaming evaluation of material properties over large inputs.
+
+Solver output easily contains millions of states, which don't need to be in memory at once. The readers in this
+module split a source of state rows, such as a CSV file, a NumPy array or an iterator of rows, into chunks of
+columns. :func:`stream` evaluates a material once per chunk, with the columns of the chunk as array-valued state
+variables, and yields the requested properties per chunk::
+
+    chunks = read_csv('solution.csv', {'temperature': 'degC', 'pressure': 'MPa', 'shear_rate': '1/s'})
+    for result in stream(pla, chunks, ['viscosity_dynamic']):
+        ...
+
+Only a single chunk of the input and its results are in memory at any time. The columns are set as Quantities, so
+they are converted to the units of the material and checked against the ranges of its guards as usual.
+"""
+
+import csv
+from itertools import islice
+
+from numpy import array, float64, load
+
+from mechmat import ureg
+
+__all__ = ['stream', 'read_csv', 'read_array', 'read_rows']
+
+
+def _quantities(columns, units):
+    return {name: ureg.Quantity(column, units[name]) if units[name] is not None else column
+            for name, column in columns.items()}
+
+
+def read_rows(rows, units, chunksize=65536):
+    r"""
+    Chunks of an iterable of state rows
+
+    Args:
+        rows: Iterable of rows, either mappings of the attributes to their magnitudes or sequences of magnitudes in
+         the order of units
+        units (dict): The attributes and their units, None for dimensionless values without a unit
+        chunksize (int): Maximum number of rows per chunk
+
+    Returns:
+        Generator of dicts of the attributes with a Quantity array per chunk
+    """
+    names = list(units)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        if isinstance(chunk[0], dict):
+            chunk = [[row[name] for name in names] for row in chunk]
+        columns = array(chunk, dtype=float64).reshape(len(chunk), len(names)).T
+        yield _quantities(dict(zip(names, columns)), units)
+
+
+def read_csv(filename, units, chunksize=65536, delimiter=',', names=None):
+    r"""
+    Chunks of the state rows in a CSV file
+
+    Args:
+        filename (str): The CSV file
+        units (dict): The attributes to read and their units, columns of the file which aren't in units are skipped
+        chunksize (int): Maximum number of rows per chunk
+        delimiter (str): The delimiter of the columns
+        names (list): The attribute of each column, by default the first row of the file is a header with the
+         attributes
+
+    Returns:
+        Generator of dicts of the attributes with a Quantity array per chunk
+    """
+    with open(filename, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if names is None:
+            names = [name.strip() for name in next(reader)]
+        indices = [names.index(name) for name in units]
+        rows = ([row[i] for i in indices] for row in reader if row)
+        for chunk in read_rows(rows, units, chunksize=chunksize):
+            yield chunk
+
+
+def read_array(source, names, units, chunksize=65536):
+    r"""
+    Chunks of the state rows in a two-dimensional array, with a row per state and a column per attribute
+
+    Args:
+        source: The array, or the file name of a ``.npy`` file which is memory-mapped
+        names (list): The attribute of each column
+        units (dict): The attributes to read and their units
+        chunksize (int): Maximum number of rows per chunk
+
+    Returns:
+        Generator of dicts of the attributes with a Quantity array per chunk
+    """
+    if isinstance(source, str):
+        source = load(source, mmap_mode='r')
+    indices = {name: names.index(name) for name in units}
+    for start in range(0, source.shape[0], chunksize):
+        chunk = source[start:start + chunksize]
+        yield _quantities({name: array(chunk[:, index], dtype=float64) for name, index in indices.items()}, units)
+
+
+def stream(material, chunks, outputs):
+    r"""
+    Evaluate properties of a material chunk by chunk
+
+    Args:
+        material: The material, each chunk is evaluated in a state derived from it
+        chunks: Iterable of dicts of state attributes with Quantity arrays, such as the readers of this module yield
+        outputs (list): The attributes to evaluate
+
+    Returns:
+        Generator of dicts of the outputs with a Quantity array per chunk
+    """
+    outputs = list(outputs)
+    for chunk in chunks:
+        state = material(**chunk)
+        yield {name: getattr(state, name) for name in outputs}
@@ -0,0 +1,133 @@
+r"""
+Lookup-table surrogates of material properties.
+
+A property of a material, such as the viscosity from a Cross-WLF model, is usually a smooth function of a few state
+variables. A :class:`Surrogate` samples the property once over a regular grid of those state variables, by setting
+the grid on the material and evaluating its linked attributes. Later queries are interpolated from the table, only
+queries outside the grid are evaluated exactly with the material.
+
+The interpolation error is checked against exact evaluation in the centre of every grid cell, where the error of a
+smooth function is largest. When a relative tolerance is given, the grid is refined until the error at the cell
+centres is within that tolerance. Properties with a discontinuity, such as the specific volume of the two-domain
+Tait model at the transition temperature, don't converge across it; span such a surrogate over a single domain.
+"""
+
+from numpy import asarray, broadcast_arrays, exp, float64, isfinite, log, sqrt, meshgrid, abs, max, stack, empty, \
+    unique, concatenate
+from scipy.interpolate import RegularGridInterpolator
+
+from mechmat import ureg
+
+__all__ = ['Surrogate']
+
+
+class Surrogate:
+    r"""
+    Lookup table of a material property over a regular grid of state variables
+
+    Args:
+        material (Chainable): The material, state variables which are not an axis keep their current value
+        output (str): The attribute to tabulate
+        method (str): Interpolation method of `scipy.interpolate.RegularGridInterpolator`, 'linear' or 'cubic'
+        dtype: Data type in which the table is stored, float64 or float32
+        log (bool): Interpolate the logarithm of the property, for properties spanning orders of magnitude such as
+         the viscosity
+        log_axes (tuple): Axes along which the logarithm is interpolated, such as the shear rate
+        rtol (float): Relative tolerance at the cell centres, the grid is refined until it is met. None skips
+         the refinement
+        max_refinements (int): Maximum number of times the grid is refined. Each refinement doubles the number of
+         cells along every axis
+        **axes: The state variables spanning the grid, as monotonically increasing Quantity arrays
+
+    Raises:
+        ValueError: When the tolerance isn't met after the maximum number of refinements
+    """
+
+    def __init__(self, material, output, method='linear', dtype=float64, log=False, log_axes=(), rtol=None,
+                 max_refinements=3, **axes):
+        self.material = material
+        self.output = output
+        self.method = method
+        self.dtype = dtype
+        self.log = log
+        self.log_axes = tuple(log_axes)
+        self._names = list(axes.keys())
+        self._units = [value.u for value in axes.values()]
+        self.axes = [asarray(value.m, dtype=float64) for value in axes.values()]
+        self.unit = None
+        self.error = None
+        for refinement in range(max_refinements + 1):
+            self._sample()
+            if rtol is None or self.error <= rtol:
+                break
+            if refinement == max_refinements:
+                raise ValueError('Surrogate of {} exceeds a relative error of {} after {} refinements: {}'.format(
+                    output, rtol, max_refinements, self.error))
+            self.axes = [unique(concatenate([axis, self._centres(name, axis)])) for name, axis in
+                         zip(self._names, self.axes)]
+
+    def _centres(self, name, axis):
+        if name in self.log_axes:
+            return sqrt(axis[1:] * axis[:-1])
+        return (axis[1:] + axis[:-1]) / 2.
+
+    def _coordinates(self, points):
+        return [log(point) if name in self.log_axes else point for name, point in zip(self._names, points)]
+
+    def _exact(self, points):
+        r"""
+        Evaluate the output exactly
+
+        Args:
+            points (list): Magnitudes per axis, in the units of the axes
+
+        Returns:
+            The magnitudes of the output
+        """
+        state = self.material(**{name: ureg.Quantity(point, unit) for name, point, unit in
+                                 zip(self._names, points, self._units)})
+        value = getattr(state, self.output)
+        if self.unit is None:
+            self.unit = value.u
+        return asarray(value.m_as(self.unit), dtype=float64)
+
+    def _sample(self):
+        grid = meshgrid(*self.axes, indexing='ij')
+        values = self._exact(grid) * (grid[0] * 0. + 1.)
+        self.values = (log(values) if self.log else values).astype(self.dtype)
+        self._interp = RegularGridInterpolator(self._coordinates(self.axes), self.values, method=self.method,
+                                               bounds_error=False, fill_value=None)
+        centres = meshgrid(*[self._centres(name, axis) for name, axis in zip(self._names, self.axes)], indexing='ij')
+        exact = self._exact(centres) * (centres[0] * 0. + 1.)
+        approximate = self._interpolate(centres)
+        self.error = float(max(abs(approximate - exact) / abs(exact)))
+
+    def _interpolate(self, points):
+        values = self._interp(stack([p.ravel() for p in self._coordinates(points)], axis=-1)).reshape(points[0].shape)
+        return exp(values) if self.log else values
+
+    def __call__(self, **kwargs):
+        r"""
+        The property at a state, interpolated within the grid and evaluated exactly outside it
+
+        Args:
+            **kwargs: The state variables of all axes, as Quantity scalars or arrays
+
+        Returns:
+            The property as Quantity
+        """
+        points = broadcast_arrays(*[asarray(kwargs[name].m_as(unit), dtype=float64)
+                                    for name, unit in zip(self._names, self._units)])
+        inside = isfinite(points[0])
+        for point, axis in zip(points, self.axes):
+            inside &= (point >= axis[0]) & (point <= axis[-1])
+        result = empty(points[0].shape)
+        result[inside] = self._interpolate([point[inside] for point in points])
+        outside = ~inside
+        if outside.any():
+            result[outside] = self._exact([point[outside] for point in points])
+        return ureg.Quantity(result if result.ndim else float(result), self.unit)
+
+    def __repr__(self):
+        return '<Surrogate {} over {} with relative error {:.2e}>'.format(
+            self.output, ', '.join('{} [{}]'.format(n, len(a)) for n, a in zip(self._names, self.axes)), self.error)
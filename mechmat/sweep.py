@@ -0,0 +1,147 @@
+r"""
+Parallel evaluation of material properties over many states.
+
+Propagation through the linked attributes is pure Python, so a sweep over many states, such as a design of
+experiments over temperature, pressure and shear rate, only scales with processes. :func:`sweep` evaluates the
+requested outputs of a material for an iterable of states over a process pool.
+
+Only the identity of the material class and its inputs (see :func:`mechmat.serialization.inputs`) are sent to the
+workers, each worker builds the material once. The states are sent in chunks, for each chunk the workers return the
+outputs as arrays. Use :func:`sweep_chunks` to process the results of a large sweep while it runs::
+
+    result = sweep(pla, ({'temperature': T, 'pressure': p} for T, p in doe), ['viscosity_dynamic'], processes=64)
+"""
+
+from itertools import islice
+from multiprocessing import get_context
+
+from numpy import asarray, concatenate, full, nan, stack
+
+from mechmat import ureg
+from mechmat.material import material_type_factory
+from mechmat.serialization import inputs
+
+__all__ = ['sweep', 'sweep_chunks']
+
+_material = None
+
+
+def _build(dtypes, flow, values):
+    return material_type_factory(*dtypes, flow=flow)()(**values)
+
+
+def _initialize(dtypes, flow, values):
+    global _material
+    _material = _build(dtypes, flow, values)
+
+
+def _magnitude(value, unit):
+    if unit is None:
+        return asarray(value)
+    return asarray(value.m_as(unit))
+
+
+def _evaluate(task, material=None):
+    if material is None:
+        material = _material
+    states, outputs, units, errors = task
+    results = {name: [] for name in outputs}
+    for state in states:
+        try:
+            evaluated = material(**state)
+            values = [_magnitude(getattr(evaluated, name), unit) for name, unit in zip(outputs, units)]
+        except ValueError:
+            if errors == 'raise':
+                raise
+            values = [nan] * len(outputs)
+        for name, value in zip(outputs, values):
+            results[name].append(value)
+    return {name: _stack(values) for name, values in results.items()}
+
+
+def _stack(values):
+    shapes = {asarray(value).shape for value in values if asarray(value).ndim}
+    shape = shapes.pop() if len(shapes) == 1 else ()
+    return stack([full(shape, nan) if asarray(value).shape != shape else value for value in values])
+
+
+def _chunks(states, chunksize):
+    states = iter(states)
+    while True:
+        chunk = list(islice(states, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sweep_chunks(material, states, outputs, processes=None, chunksize=64, errors='raise'):
+    r"""
+    Evaluate outputs of a material over many states in a process pool, yielding the results per chunk of states
+
+    Args:
+        material: The material, the states are derived from it
+        states: Iterable of dicts with the attributes of each state, the iterable is consumed while the pool runs
+        outputs (list): The attributes to evaluate, in the unit of the material or the unit of their guard
+        processes (int): Number of worker processes, defaults to the number of CPUs. With 1 the states are evaluated
+         in this process
+        chunksize (int): Number of states sent to a worker at once
+        errors (str): 'raise' to raise errors of a state, 'nan' to return NaN for states raising a ValueError, such
+         as values out of range
+
+    Returns:
+        Generator of dicts with the outputs as Quantity arrays, the states of the chunk along the first axis, in the
+        order of the states
+    """
+    outputs = list(outputs)
+    units = []
+    for name in outputs:
+        value = getattr(material, name)
+        if isinstance(value, ureg.Quantity):
+            units.append(value.u)
+        else:
+            units.append(getattr(material, '_Guard_{}_unit'.format(name), None))
+    args = (type(material).dtypes, type(material).flow, inputs(material))
+    tasks = ((chunk, outputs, units, errors) for chunk in _chunks(states, chunksize))
+    if processes == 1:
+        local = _build(*args)
+        results = (_evaluate(task, local) for task in tasks)
+        pool = None
+    else:
+        pool = get_context().Pool(processes, initializer=_initialize, initargs=args)
+        results = pool.imap(_evaluate, tasks)
+    try:
+        for result in results:
+            yield {name: result[name] if unit is None else ureg.Quantity(result[name], unit)
+                   for name, unit in zip(outputs, units)}
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def sweep(material, states, outputs, processes=None, chunksize=64, errors='raise'):
+    r"""
+    Evaluate outputs of a material over many states in a process pool
+
+    Args:
+        material: The material, the states are derived from it
+        states: Iterable of dicts with the attributes of each state
+        outputs (list): The attributes to evaluate
+        processes (int): Number of worker processes, defaults to the number of CPUs. With 1 the states are evaluated
+         in this process
+        chunksize (int): Number of states sent to a worker at once
+        errors (str): 'raise' to raise errors of a state, 'nan' to return NaN for states raising a ValueError, such
+         as values out of range
+
+    Returns:
+        dict with the outputs as Quantity arrays, the states along the first axis
+    """
+    chunks = list(sweep_chunks(material, states, outputs, processes=processes, chunksize=chunksize, errors=errors))
+    result = {}
+    for name in outputs:
+        values = [chunk[name] for chunk in chunks]
+        if values and isinstance(values[0], ureg.Quantity):
+            result[name] = ureg.Quantity(concatenate([value.m for value in values]), values[0].u)
+        else:
+            result[name] = concatenate(values) if values else asarray([])
+    return result
@@ -7,6 +7,8 @@ import pytest
 
 from mechmat import ureg as u
 from mechmat.core.errors import OutOfRangeError
+from mechmat.core.tracing import Tracer, trace
+from mechmat.principal.core import Interp
 from pint import DimensionalityError
 
 
@@ -14,11 +16,11 @@ from pint import DimensionalityError
 def simple_material():
     from mechmat.material import material_factory
 
-    mat = material_factory(True,
+    mat = material_factory(flow=True,
                            name='simple material',
                            temperature=20. * u.degC,
                            pressure=1. * u.bar,
-                           volumeflow=100. * u.mm * 3)
+                           volumeflow=100. * u.mm ** 3 / u.s)
 
     return mat
 
@@ -31,6 +33,35 @@ def test_state(simple_material):
 def test_markdown(simple_material):
     print(simple_material._repr_markdown_())
 
+
+@pytest.fixture
+def pla():
+    from mechmat.material import material_factory
+    from mechmat.polymer import PolyLacticAcid
+
+    return material_factory(PolyLacticAcid, flow=True, name='PLA', temperature=200. * u.degC, pressure=10. * u.MPa,
+                            shear_rate=100. * u.s ** -1)
+
+
+def test_propagation(pla):
+    mat_a = pla(temperature=230. * u.degC)
+    assert mat_a.specific_volume != pla.specific_volume
+    assert mat_a.density.m == pytest.approx(1. / mat_a.specific_volume.m)
+    assert mat_a.viscosity_kinematic.m == pytest.approx((mat_a.viscosity_dynamic / mat_a.density).m)
+    assert mat_a._b_1 == mat_a.b_1m
+    mat_b = pla(temperature=50. * u.degC)
+    assert mat_b._b_1 == mat_b.b_1s
+
+
+def test_propagation_plan_shared(pla):
+    other = type(pla)()
+    other.pressure = 10. * u.MPa
+    plan = pla._propagation.plan(pla, 'pressure')
+    assert other._propagation is pla._propagation
+    assert len(plan) == len(set(step.attr for step in plan))
+    order = [step.attr for step in plan]
+    assert order.index('temperature_transition') < order.index('_b_1') < order.index('specific_volume')
+
 # def test_mod_state(simple_material):
 #     mat_a = simple_material()
 #     mat_a.y = 9. * u.m ** 2
@@ -62,3 +93,510 @@ def test_markdown(simple_material):
 #     mat_a = simple_material()
 #     mat_a.x = 1. * u.ft
 #     assert mat_a.x.m == pytest.approx(0.3048)
+
+
+def test_vectorized_state(pla):
+    import numpy as np
+
+    temperature = np.array([50., 150., 250.]) * u.degC
+    pressure = np.array([1., 100.]) * u.MPa
+    grid = pla(temperature=temperature.reshape(-1, 1), pressure=pressure, shear_rate=np.array([10., 1000.]) * u.s ** -1)
+    assert grid.specific_volume.shape == (3, 2)
+    for i, T in enumerate(temperature):
+        for j, p in enumerate(pressure):
+            point = pla(temperature=T, pressure=p, shear_rate=grid.shear_rate[j])
+            assert grid.specific_volume[i, j].m == pytest.approx(point.specific_volume.m)
+            assert grid.viscosity_dynamic[i, j].m == pytest.approx(point.viscosity_dynamic.m)
+            assert grid._b_1[i, j] == point._b_1
+
+
+def test_vectorized_out_of_range(pla):
+    import numpy as np
+
+    with pytest.raises(OutOfRangeError):
+        pla(temperature=np.array([20., -300.]) * u.degC)
+
+
+def test_derived_state_shares_links(pla):
+    from mechmat.principal import core
+
+    mat_a = pla(temperature=50. * u.degC)
+    assert mat_a._linked_attributes is pla._linked_attributes
+    assert mat_a._propagation is pla._propagation
+    mat_a.link_attr('thermal_expansion_coeff', core.reciprocal, value='temperature')
+    assert mat_a._linked_attributes is not pla._linked_attributes
+    assert 'thermal_expansion_coeff' not in pla._linked_attributes
+    mat_a.temperature = 20. * u.degC
+    assert pla.temperature == 200. * u.degC
+
+
+def test_material_type_cache(pla):
+    import dill
+    from mechmat.core.propagation import graph_for
+    from mechmat.material import _InitializedMaterial, material_type_factory, warm_material_types
+    from mechmat.polymer import PolyLacticAcid
+
+    assert material_type_factory(PolyLacticAcid, flow=True) is type(pla)
+    assert type(dill.loads(dill.dumps(pla))) is type(pla)
+    with pytest.raises(ValueError):
+        _InitializedMaterial()((PolyLacticAcid,), True, type(pla)._version + 1)
+    cls, = warm_material_types(((PolyLacticAcid,), True))
+    assert cls is type(pla)
+    assert 'temperature' in graph_for(cls())._plans
+
+
+def test_lazy_evaluation(pla):
+    lazy = pla(lazy=True)
+    for key, value in [('temperature', 230. * u.degC), ('pressure', 80. * u.MPa), ('shear_rate', 1e4 * u.s ** -1)]:
+        eager = pla(**{key: value})
+        mat_a = lazy(**{key: value})
+        assert 'viscosity_dynamic' in mat_a._dirty
+        assert mat_a.viscosity_dynamic == eager.viscosity_dynamic
+        assert 'viscosity_dynamic' not in mat_a._dirty
+        assert repr(mat_a) == repr(eager)
+    mat_b = lazy(temperature=230. * u.degC)
+    mat_b.lazy = False
+    assert not mat_b._dirty
+
+
+def test_lazy_multiple_assignments(pla):
+    from mechmat.material import material_factory
+    from mechmat.polymer import PolyLacticAcid
+
+    sequences = [[('shear_rate', 1e4 * u.s ** -1), ('temperature', 100. * u.degC)],
+                 [('pressure', 80. * u.MPa), ('shear_rate', 10. * u.s ** -1), ('temperature', 230. * u.degC)],
+                 [('temperature', 180. * u.degC), ('pressure', 0.1 * u.MPa), ('temperature', 100. * u.degC),
+                  ('shear_rate', 1e4 * u.s ** -1)]]
+    for sequence in sequences:
+        lazy = pla(lazy=True)
+        eager = pla()
+        for key, value in sequence:
+            setattr(lazy, key, value)
+            setattr(eager, key, value)
+        state = dict(temperature=200. * u.degC, pressure=10. * u.MPa, shear_rate=100. * u.s ** -1)
+        state.update(sequence)
+        fresh = material_factory(PolyLacticAcid, flow=True, name='PLA', **state)
+        for name in ['viscosity_dynamic', 'viscosity_kinematic', 'density', 'specific_volume',
+                     'temperature_transition']:
+            assert getattr(lazy, name).m == pytest.approx(getattr(eager, name).m)
+            assert getattr(eager, name).m == pytest.approx(getattr(fresh, name).m)
+
+
+def test_fast_path(pla):
+    fast = pla(fast=True)
+    for key, value in [('temperature', 230. * u.degC), ('pressure', 80. * u.MPa), ('shear_rate', 1e4 * u.s ** -1)]:
+        eager = pla(**{key: value})
+        mat_a = fast(**{key: value})
+        assert isinstance(mat_a.viscosity_dynamic, u.Quantity)
+        assert mat_a.viscosity_dynamic.to('Pa*s').m == pytest.approx(eager.viscosity_dynamic.to('Pa*s').m)
+        assert mat_a.specific_volume.to('m**3/kg').m == pytest.approx(eager.specific_volume.to('m**3/kg').m)
+    mat_b = fast(temperature=230. * u.degC)
+    mat_b.fast = False
+    assert mat_b._si is None
+    assert mat_b.temperature.to('degC').m == pytest.approx(230.)
+
+
+def test_tracing(pla):
+    import threading
+
+    other = pla()
+    with trace() as tracer:
+        pla.pressure = 80. * u.MPa
+        thread = threading.Thread(target=setattr, args=(other, 'pressure', 80. * u.MPa))
+        thread.start()
+        thread.join()
+    tree = tracer.call_tree()
+    assert len(tree) == 1 and tree[0]['attr'] == 'pressure'
+    assert any(node['attr'] == 'temperature_transition' for node in tree[0]['children'])
+    assert 'specific_volume (twodomaintaitpvt.get_specific_volume)' in tracer.folded()
+    changed = {event.attr: event.changed for event in tracer.events}
+    assert changed['specific_volume'] and not changed['_b_1']
+    recorded = len(tracer.events)
+    pla.pressure = 10. * u.MPa
+    assert len(tracer.events) == recorded
+    pla.tracer = Tracer()
+    pla.pressure = 80. * u.MPa
+    assert len(pla.tracer.events) == recorded
+
+
+def test_change_detection(pla):
+    for tolerance, recomputed in [(0., False), (None, True)]:
+        mat = pla()
+        mat.tolerance = tolerance
+        mat.tracer = Tracer()
+        mat.pressure = 80. * u.MPa
+        attrs = [event.attr for event in mat.tracer.events]
+        assert '_b_1' in attrs and 'specific_volume' in attrs
+        assert ('specific_volume_zero_gauge_pressure' in attrs) == recomputed
+        assert mat.specific_volume == pla(pressure=80. * u.MPa).specific_volume
+
+
+def test_batch_update(pla):
+    state = dict(temperature=230. * u.degC, pressure=80. * u.MPa, shear_rate=1e4 * u.s ** -1)
+    sequential = pla()
+    for key, value in state.items():
+        setattr(sequential, key, value)
+    mat = pla()
+    mat.tracer = Tracer()
+    mat.update(**state)
+    attrs = [event.attr for event in mat.tracer.events]
+    assert len(attrs) == len(set(attrs))
+    assert attrs[0] == 'pressure, shear_rate, temperature'
+    assert mat.viscosity_dynamic == sequential.viscosity_dynamic
+    assert mat.specific_volume == sequential.specific_volume
+    with mat.batch():
+        mat.temperature = 200. * u.degC
+        mat.pressure = 10. * u.MPa
+        mat.shear_rate = 100. * u.s ** -1
+        assert mat.viscosity_dynamic == sequential.viscosity_dynamic
+    assert mat.viscosity_dynamic == pla.viscosity_dynamic
+
+
+def test_interp():
+    import numpy as np
+    temperature = np.linspace(100., 300., 21) * u.degC
+    cp = (1.2 + 3e-3 * temperature.m) * u.kJ / (u.kg * u.K)
+    for kind in ['linear', 'cubic', 'pchip']:
+        interp = Interp(kind=kind, T=temperature, cp=cp)
+        assert interp(T=450. * u.K).m == pytest.approx(1.2 + 3e-3 * 176.85)
+        assert interp(T=np.array([150., 200.]) * u.degC).m == pytest.approx([1.65, 1.8])
+    with pytest.raises(ValueError):
+        interp(T=400. * u.degC)
+    x, y = np.linspace(0., 1., 11), np.linspace(0., 2., 21)
+    grid = Interp(kind='linear', x=x * u.m, y=y * u.s, z=np.add.outer(x, y) * u.Pa, indexing='ij')
+    legacy = Interp(kind='linear', x=x * u.m, y=y * u.s, z=np.add.outer(x, y).T * u.Pa)
+    points = np.random.rand(2, 1000) * [[1.], [2.]]
+    assert grid(x=points[0] * u.m, y=points[1] * u.s).m == pytest.approx(points.sum(axis=0))
+    assert legacy(x=0.5 * u.m, y=1.5 * u.s) == grid(x=0.5 * u.m, y=1.5 * u.s)
+    y = np.linspace(0., 2., 11)
+    z = np.add.outer(x, 2. * y)
+    square = Interp(kind='linear', x=x * u.m, y=y * u.s, z=z * u.Pa, indexing='ij')
+    legacy = Interp(kind='linear', x=x * u.m, y=y * u.s, z=z.T * u.Pa)
+    for interp in (square, legacy):
+        assert interp(x=0.2 * u.m, y=1.5 * u.s).m == pytest.approx(3.2)
+
+
+def test_surrogate(pla):
+    import numpy as np
+    from mechmat.surrogate import Surrogate
+
+    surrogate = Surrogate(pla, 'viscosity_dynamic', log=True, log_axes=['shear_rate'], rtol=5e-3,
+                          temperature=np.linspace(180., 260., 9) * u.degC, shear_rate=np.logspace(0, 5, 11) / u.s)
+    assert surrogate.error <= 5e-3
+    temperature = np.random.uniform(180., 260., 1000) * u.degC
+    shear_rate = 10. ** np.random.uniform(0., 5., 1000) / u.s
+    exact = pla(temperature=temperature, shear_rate=shear_rate).viscosity_dynamic
+    approximate = surrogate(temperature=temperature, shear_rate=shear_rate)
+    assert np.all(np.abs(approximate.m / exact.m - 1.) <= 2. * surrogate.error)
+    outside = surrogate(temperature=300. * u.degC, shear_rate=10. / u.s)
+    assert outside == pla(temperature=300. * u.degC, shear_rate=10. / u.s).viscosity_dynamic
+
+
+def test_specific_volume_grid(pla):
+    import numpy as np
+
+    temperature = np.linspace(20., 260., 25)[:, None] * u.degC
+    pressure = np.linspace(0.1, 200., 10) * u.MPa
+    volume, transition, melt = pla.specific_volume_grid(temperature, pressure, full_output=True)
+    exact = pla(temperature=temperature, pressure=pressure)
+    assert volume.shape == (25, 10)
+    assert volume.m == pytest.approx(exact.specific_volume.to('m**3/kg').m)
+    assert transition.to('degC').m == pytest.approx(exact.temperature_transition.to('degC').m)
+    assert melt.any() and not melt.all()
+
+
+def test_viscosity_dynamic_grid(pla):
+    import numpy as np
+
+    temperature = np.array([200., 230., 260.]) * u.degC
+    shear_rate = np.array([10., 1e3, 1e5]) / u.s
+    eta, d_eta_d_T, d_eta_d_shear_rate = pla.viscosity_dynamic_grid(temperature, 10. * u.MPa, shear_rate,
+                                                                    derivatives=True)
+    assert eta.m == pytest.approx(pla(temperature=temperature, shear_rate=shear_rate).viscosity_dynamic.m)
+    h = 1e-3
+    forward = pla.viscosity_dynamic_grid(temperature + h * u.delta_degC, 10. * u.MPa, shear_rate)
+    backward = pla.viscosity_dynamic_grid(temperature - h * u.delta_degC, 10. * u.MPa, shear_rate)
+    assert d_eta_d_T.m == pytest.approx((forward - backward).m / (2. * h), rel=1e-5)
+    forward = pla.viscosity_dynamic_grid(temperature, 10. * u.MPa, shear_rate * (1. + h))
+    backward = pla.viscosity_dynamic_grid(temperature, 10. * u.MPa, shear_rate * (1. - h))
+    assert d_eta_d_shear_rate.m == pytest.approx((forward - backward).m / (2. * h * shear_rate.m), rel=1e-5)
+
+
+def test_cross_arrhenius_batch():
+    import numpy as np
+    from mechmat.material import material_factory
+    from mechmat.properties.viscosity import CrossArrhenius, CrossArrheniusBatch
+
+    materials = []
+    for i in range(3):
+        mat = material_factory(CrossArrhenius, flow=True)
+        mat.arrhenius_activation_energy = (40. + 10. * i) * u.kJ / u.mol
+        mat.temperature_cross_arrhenius_ref = 200. * u.degC
+        mat.relaxation_time_ref = 0.01 * (i + 1) * u.s
+        mat.viscosity_zero_shear_rate_ref = 1e3 * u.Pa * u.s
+        mat.shear_thinning_const = 0.7 * u.dimensionless
+        materials.append(mat)
+    temperature = np.array([180., 220., 260.]) * u.degC
+    shear_rate = np.array([10., 100., 1000.]) / u.s
+    result = CrossArrheniusBatch.from_materials(materials)(temperature, shear_rate)
+    assert result['viscosity_dynamic'].shape == (3, 3)
+    for mat, row in zip(materials, result['viscosity_dynamic']):
+        exact = mat(temperature=temperature, shear_rate=shear_rate).viscosity_dynamic
+        assert row.m == pytest.approx(exact.m)
+    mat = materials[0]
+    single = CrossArrheniusBatch(mat.arrhenius_activation_energy, mat.temperature_cross_arrhenius_ref,
+                                 mat.relaxation_time_ref, mat.viscosity_zero_shear_rate_ref, mat.shear_thinning_const)
+    assert len(single) == 1
+    assert single(temperature, shear_rate)['viscosity_dynamic'][0].m == pytest.approx(result['viscosity_dynamic'][0].m)
+
+
+def test_serialization(pla, simple_material, tmpdir):
+    import os
+    import numpy as np
+    from mechmat import serialization
+    from mechmat.material import Material, material_factory
+    from mechmat.polymer import PolyLacticAcid
+
+    states = [pla(temperature=230. * u.degC), pla(temperature=np.array([190., 210.]) * u.degC), simple_material]
+    filename = str(tmpdir.join('materials.npz'))
+    serialization.dump(states, filename)
+    loaded = serialization.load(filename)
+    assert [type(mat) for mat in loaded] == [type(mat) for mat in states]
+    assert all(mat.lazy for mat in loaded)
+    assert not any(mat.lazy for mat in serialization.load(filename, lazy=False))
+    for state, mat in zip(states[:2], loaded):
+        fresh = material_factory(PolyLacticAcid, flow=True, **serialization.inputs(state))
+        assert mat.name == 'PLA'
+        assert mat.specific_volume.m == pytest.approx(fresh.specific_volume.m)
+        assert mat.viscosity_dynamic.m == pytest.approx(fresh.viscosity_dynamic.m)
+    assert loaded[2].temperature.m_as(u.degC) == pytest.approx(20.)
+    assert loaded[2].name == 'simple material'
+    overridden = pla(temperature_transition=133.29 * u.degC, tau_star=pla.tau_star * 1.3)
+    computed = serialization.inputs(pla(temperature=230. * u.degC))
+    assert set(computed) == {'name', 'temperature', 'pressure', 'shear_rate'}
+    serialization.dump(overridden, filename)
+    mat, = serialization.load(filename)
+    assert mat.temperature_transition.m_as(u.degC) == pytest.approx(133.29)
+    assert mat.tau_star == overridden.tau_star
+    assert mat.viscosity_dynamic.m == pytest.approx(overridden.viscosity_dynamic.m)
+    Material.dump(pla, str(tmpdir.join('pla.mat')))
+    assert Material.load(str(tmpdir.join('pla.mat'))).temperature == pla.temperature
+    legacy = Material.load(os.path.join(os.path.dirname(__file__), 'data', 'pla_baseline.mat'))
+    assert legacy.viscosity_dynamic.m == pytest.approx(pla.viscosity_dynamic.m)
+    legacy.temperature = 230. * u.degC
+    assert legacy.viscosity_dynamic.m == pytest.approx(pla(temperature=230. * u.degC).viscosity_dynamic.m)
+    assert legacy.viscosity_dynamic.m != pytest.approx(pla.viscosity_dynamic.m)
+
+
+def test_state_store(pla, tmpdir):
+    import numpy as np
+    from mechmat.store import StateStore
+
+    temperatures = np.linspace(180., 250., 8)
+    states = [pla(temperature=t * u.degC) for t in temperatures]
+    path = str(tmpdir.join('sweep'))
+    StateStore.create(path, iter(states), length=len(states))
+    store = StateStore(path)
+    assert len(store) == 8
+    assert 'viscosity_dynamic' in store.columns
+    assert isinstance(store.magnitude('viscosity_dynamic'), np.memmap)
+    assert store['temperature'].m_as(u.degC) == pytest.approx(temperatures)
+    assert store['viscosity_dynamic'].m == pytest.approx([s.viscosity_dynamic.m_as(u.Pa * u.s) for s in states])
+
+
+def test_library(pla, simple_material, tmpdir):
+    from mechmat import serialization
+    from mechmat.library import Library
+    from mechmat.material import material_factory
+    from mechmat.polymer import PolyLacticAcid
+
+    grades = [pla(temperature=t * u.degC, name='PLA {}'.format(t), CAS='26100-51-6') for t in (190., 210., 230.)]
+    for archive in (True, False):
+        path = str(tmpdir.join('archive' if archive else 'files'))
+        Library.create(path, grades + [simple_material], archive=archive)
+        library = Library(path)
+        assert len(library) == 4 and library._cache == {}
+        assert library['PLA 210.0'].temperature.m_as(u.degC) == pytest.approx(210.)
+        assert list(library._cache) == [1]
+        assert [mat.name for mat in library.find(CAS='26100-51-6')] == ['PLA 190.0', 'PLA 210.0', 'PLA 230.0']
+        assert library.find(name='PLA 230.0', CAS='26100-51-6')[0] is library.load(2)
+        assert 'simple material' in library and 'PVC' not in library
+    library.add(pla)
+    assert Library(path).find(name='PLA')[0].temperature == pla.temperature
+    library.clear_cache()
+    materials = library.load_all(processes=2, chunksize=2)
+    assert [mat.name for mat in materials][-2:] == ['simple material', 'PLA']
+    fresh = material_factory(PolyLacticAcid, flow=True, **serialization.inputs(grades[0]))
+    assert materials[0].viscosity_dynamic.m == pytest.approx(fresh.viscosity_dynamic.m)
+
+
+def test_sweep(pla):
+    import numpy as np
+    from mechmat.sweep import sweep
+
+    states = [{'temperature': t * u.degC, 'shear_rate': g / u.s} for t in np.linspace(180., 250., 4)
+              for g in (10., 1000.)]
+    states.append({'temperature': -300. * u.degC})
+    result = sweep(pla, states, ['viscosity_dynamic', 'specific_volume'], processes=2, chunksize=3, errors='nan')
+    assert result['viscosity_dynamic'].shape == (9,)
+    for state, viscosity in zip(states[:-1], result['viscosity_dynamic'].m):
+        assert viscosity == pytest.approx(pla(**state).viscosity_dynamic.m_as(u.Pa * u.s))
+    assert np.isnan(result['specific_volume'].m[-1])
+    with pytest.raises(OutOfRangeError):
+        sweep(pla, states[-1:], ['viscosity_dynamic'], processes=1)
+    overridden = pla(temperature_transition=133.29 * u.degC)
+    for processes in (1, 2):
+        result = sweep(overridden, states[:2], ['temperature_transition', 'viscosity_dynamic'], processes=processes)
+        assert result['temperature_transition'].m_as(u.degC) == pytest.approx([133.29] * 2)
+        assert result['viscosity_dynamic'].m == pytest.approx([overridden(**state).viscosity_dynamic.m
+                                                               for state in states[:2]])
+
+
+def test_stream(pla, tmpdir):
+    import numpy as np
+    from mechmat.stream import stream, read_csv, read_array
+
+    rows = np.array([[180. + 10. * i, 10. + i, 10. ** (1 + i % 3)] for i in range(7)])
+    filename = str(tmpdir.join('states.csv'))
+    np.savetxt(filename, rows, delimiter=',', header='temperature,pressure,shear_rate', comments='')
+    units = {'temperature': 'degC', 'pressure': 'MPa', 'shear_rate': '1/s'}
+    results = list(stream(pla, read_csv(filename, units, chunksize=3), ['viscosity_dynamic']))
+    assert [len(result['viscosity_dynamic']) for result in results] == [3, 3, 1]
+    viscosity = np.concatenate([result['viscosity_dynamic'].m_as(u.Pa * u.s) for result in results])
+    for (T, p, shear_rate), eta in zip(rows, viscosity):
+        state = pla(temperature=T * u.degC, pressure=p * u.MPa, shear_rate=shear_rate / u.s)
+        assert eta == pytest.approx(state.viscosity_dynamic.m_as(u.Pa * u.s))
+    array_results = stream(pla, read_array(rows, list(units), units, chunksize=4), ['viscosity_dynamic'])
+    assert np.concatenate([r['viscosity_dynamic'].m_as(u.Pa * u.s) for r in array_results]) == pytest.approx(viscosity)
+
+
+def test_material_batch(pla):
+    import numpy as np
+    from mechmat.batch import MaterialBatch
+
+    temperature = np.linspace(180., 260., 6) * u.degC
+    batch = MaterialBatch(pla, temperature=temperature, pressure=10. * u.MPa, shear_rate=100. / u.s)
+    assert len(batch) == 6
+    for T, eta in zip(temperature, batch.viscosity_dynamic):
+        point = pla(temperature=T, pressure=10. * u.MPa, shear_rate=100. / u.s)
+        assert eta.m == pytest.approx(point.viscosity_dynamic.m)
+    batch.update(batch.temperature > 230. * u.degC, shear_rate=1000. / u.s)
+    assert list(batch['shear_rate'].m) == [100.] * 4 + [1000.] * 2
+    assert batch[5].viscosity_dynamic.m == pytest.approx(batch.viscosity_dynamic[5].m)
+    hot = batch.temperature > 230. * u.degC
+    batch.update(hot, shear_rate=1e4 / u.s)
+    batch.update(hot, temperature=100. * u.degC)
+    batch.update(slice(0, 2), pressure=80. * u.MPa)
+    for i in range(len(batch)):
+        point = pla(temperature=batch['temperature'][i], pressure=batch['pressure'][i],
+                    shear_rate=batch['shear_rate'][i])
+        for name in ['viscosity_dynamic', 'viscosity_kinematic', 'specific_volume']:
+            assert getattr(batch, name)[i].m == pytest.approx(getattr(point, name).m)
+    assert batch.column('D_1').shape == (6,)
+    assert len(batch[1:4]) == 3
+
+
+def test_class_level_links(pla):
+    cls = type(pla)
+    a, b = cls(), cls()
+    assert not {'_depended_on', '_linked_attributes', '_Guard_temperature_unit'} & set(a.__dict__)
+    assert a._depended_on is b._depended_on is pla._depended_on
+    unit = b._Guard_temperature_unit
+    a.set_guard('temperature', u.K)
+    a.link_attr('viscosity_kinematic', lambda viscosity_dynamic: viscosity_dynamic / (1000. * u.kg / u.m ** 3),
+                viscosity_dynamic='viscosity_dynamic')
+    assert b._Guard_temperature_unit == unit
+    assert a._depended_on is not b._depended_on
+    assert len(b._linked_attributes['viscosity_kinematic']) == len(pla._linked_attributes['viscosity_kinematic'])
+    b.update(temperature=200. * u.degC, pressure=10. * u.MPa)
+    assert b.specific_volume.m == pytest.approx(pla.specific_volume.m)
+
+
+def test_class_level_mutable_values():
+    from mechmat.core.chainable import Chainable
+
+    class Probe(Chainable):
+        def __init__(self, **kwargs):
+            super(Probe, self).__init__(**kwargs)
+            self.history = []
+            self.settings = {'mode': 'a'}
+
+    a, b = Probe(), Probe()
+    a.history.append(1)
+    a.settings['mode'] = 'b'
+    assert b.history == [] and b.settings == {'mode': 'a'}
+    assert Probe().history == [] and Probe().settings == {'mode': 'a'}
+    assert a._linked_attributes is b._linked_attributes
+
+
+def test_memoization(pla):
+    import threading
+    from mechmat.core.memoization import TransformCache, memoize
+
+    expected = [pla(temperature=T * u.degC, shear_rate=g / u.s).viscosity_dynamic for T in (200., 220.)
+                for g in (10., 100., 1000.)]
+    with memoize() as cache:
+        results = [pla(temperature=T * u.degC, shear_rate=g / u.s).viscosity_dynamic for T in (200., 220.)
+                   for g in (10., 100., 1000.)]
+        kelvin = pla(temperature=493.15 * u.K, shear_rate=10. / u.s).viscosity_dynamic
+    assert [r.m for r in results] == pytest.approx([e.m for e in expected])
+    assert kelvin.m == pytest.approx(expected[3].m)
+    hits, misses = cache.stats()['crosswlf.zero_shear_viscosity']
+    assert hits >= 4 and misses <= 2
+    with memoize() as cache:
+        thread = threading.Thread(target=pla, kwargs={'temperature': 230. * u.degC})
+        thread.start()
+        thread.join()
+    assert len(cache) == 0
+
+    def double(x):
+        return 2. * x
+
+    small = TransformCache(maxsize=2)
+    for T in (200., 210., 220.):
+        small(double, {'x': T * u.degC})
+    assert len(small) == 2
+    small(double, {'x': 220. * u.degC})
+    assert small.stats()['test_mechmat.double'] == (1, 3)
+
+
+def test_deferred_imports():
+    import subprocess
+    import sys
+
+    deferred = ['dill', 'matplotlib', 'scipy', 'pytablewriter', 'mechcite']
+    code = 'import sys, mechmat.material, mechmat.polymer; print(" ".join(m for m in {} if m in sys.modules))'
+    assert subprocess.check_output([sys.executable, '-c', code.format(deferred)]).strip() == b''
+
+
+def test_citations(monkeypatch):
+    import threading
+    from mechmat.core import bibliography
+    from mechmat.core.chainable import Chainable
+    from mechmat.principal import crossarrhenius, crosswlf
+
+    monkeypatch.setattr(bibliography, '_bib', None)
+    monkeypatch.setattr(bibliography, '_pending', set())
+
+    class Cited(Chainable):
+        @bibliography.cite('test_source')
+        def __init__(self, **kwargs):
+            super(Cited, self).__init__(**kwargs)
+
+    with bibliography.citations(False):
+        Cited()
+    assert bibliography._pending == set()
+    Cited()
+    assert bibliography._pending == {'test_source'}
+    assert crosswlf.zero_shear_viscosity._cite == ('osswald_polymer_2015',)
+    bibliography._pending.clear()
+    bibliography.cite_sources(crossarrhenius.cross_arrhenius)
+    assert bibliography._pending == {'osswald_polymer_2006', 'cross_rheology_1965'}
+    assert not hasattr(crosswlf.zero_shear_viscosity, '__wrapped__')
+    bibliography._pending.clear()
+    with bibliography.citations(False):
+        thread = threading.Thread(target=bibliography.cite_key, args=('other_thread',))
+        thread.start()
+        thread.join()
+        bibliography.cite_key('this_thread')
+    assert bibliography._pending == {'other_thread'}